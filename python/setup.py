@@ -21,15 +21,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from distutils.core import setup
+from setuptools import setup
 
 classifiers = ['Development Status :: 5 - Production/Stable',
                'Operating System :: POSIX :: Linux',
                'License :: OSI Approved :: MIT License',
                'Intended Audience :: Developers',
-               'Programming Language :: Python :: 2.6',
-               'Programming Language :: Python :: 2.7',
                'Programming Language :: Python :: 3',
+               'Programming Language :: Python :: 3 :: Only',
                'Topic :: Software Development',
                'Topic :: System :: Hardware']
 
@@ -43,6 +42,7 @@ setup(name		= 'st7036',
 	keywords	= 'Raspberry Pi ST7036 SPI',
 	url		= 'http://www.pimoroni.com',
 	classifiers     = classifiers,
-	py_modules	= ['st7036'],
+	py_modules	= ['st7036', 'st7036_codec', 'st7036_codec_table', 'st7036_glyphs', 'st7036_timing', 'st7036_transport', 'st7036_benchmark', 'st7036_async', 'st7036_worker', 'st7036_present', 'st7036_stats', 'st7036_trace', 'st7036_emulator', 'st7036_multi', 'st7036_widgets'],
+	python_requires	= '>=3.7',
 	install_requires= ['spidev']
 )
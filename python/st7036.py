@@ -1,17 +1,23 @@
 #!/usr/bin/env python
 
-import spidev
+import atexit
+import os
+import threading
 import time
-import RPi.GPIO as GPIO
 
 import st7036_codec
+import st7036_timing
+import st7036_transport
+from st7036_transport import LOW, HIGH
 
 COMMAND_CLEAR = 0b00000001
 COMMAND_HOME = 0b00000010
 COMMAND_SCROLL = 0b00010000
+COMMAND_SHIFT = 0b00011000
 COMMAND_DOUBLE = 0b00010000
 COMMAND_BIAS = 0b00010100
 COMMAND_SET_DISPLAY_MODE = 0b00001000
+COMMAND_ENTRY_MODE = 0b00000100
 
 BLINK_ON = 0b00000001
 CURSOR_ON = 0b00000010
@@ -19,6 +25,58 @@ DISPLAY_ON = 0b00000100
 TOP = 1
 BOTTOM = 0
 
+# Registers the controller is known to hold after a reset
+RESET_REGISTERS = {
+    'display_mode': (COMMAND_SET_DISPLAY_MODE, 0),
+    'entry_mode': (COMMAND_ENTRY_MODE | 0b00000010, 0),
+}
+
+DDRAM_SIZE = 0x80
+DDRAM_BLANK = 0x20
+
+# spidev's xfer() issues one ioctl transfer per byte, keep bursts well
+# inside the kernel's limit on transfers per message
+BULK_TRANSFER_SIZE = DDRAM_SIZE
+
+# Clean cells between two dirty runs that are cheaper to resend than
+# it is to issue another cursor move
+FLUSH_RUN_GAP = 2
+
+# Bump when the layout written by save_state() changes
+STATE_VERSION = 2
+
+# Changes on every boot, so a state file never outlives a power cycle
+BOOT_ID_PATH = '/proc/sys/kernel/random/boot_id'
+
+
+def address_steps(rows, two_line_mode):
+    """
+    Where the address counter moves to from each DDRAM address. In 2 line
+    mode it skips from the end of one line to the start of the other, a
+    single line without it spans 80 addresses.
+
+    Args:
+        rows (int): rows of the display, 1..3
+        two_line_mode (bool): whether the function set's 2 line bit is set
+    Returns:
+        tuple: lists of the next and previous address, by address
+    """
+    forward, back, size = {}, {}, DDRAM_SIZE
+    if rows < 3 and two_line_mode:
+        forward, back = {0x27: 0x40, 0x67: 0x00}, {0x40: 0x27, 0x00: 0x67}
+    elif rows < 3:
+        size = 0x50
+    return ([forward.get(offset, (offset + 1) % size) for offset in range(DDRAM_SIZE)],
+            [back.get(offset, (offset - 1) % size) for offset in range(DDRAM_SIZE)])
+
+
+def _boot_id():
+    try:
+        with open(BOOT_ID_PATH) as f:
+            return f.read().strip()
+    except (IOError, OSError):
+        return None
+
 class st7036():
     def __init__(self,
                  register_select_pin,
@@ -26,58 +84,267 @@ class st7036():
                  rows=3,
                  columns=16,
                  spi_chip_select=0,
-                 instruction_set_template=0b00111000):
-
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-
-        self.spi = spidev.SpiDev()
-        self.spi.open(0, spi_chip_select)
-        self.spi.max_speed_hz = 1000000
+                 instruction_set_template=0b00111000,
+                 framebuffer=False,
+                 bulk_transfer=True,
+                 timing=None,
+                 spi_bus=0,
+                 transport=None,
+                 encoding_errors='replace',
+                 state_file=None):
+
+        # Delays and SPI clock, see st7036_timing
+        self.timing = timing if timing is not None else st7036_timing.DATASHEET
+
+        # SPI and GPIO access, see st7036_transport
+        if transport is None:
+            transport = st7036_transport.default_transport(spi_bus, spi_chip_select)
+        transport.setup(register_select_pin, reset_pin)
+        self.transport = transport
+        self.gpio = transport.gpio
+
+        self.spi = transport.spi
+        self.spi.max_speed_hz = self.timing.max_speed_hz
+
+        # Send each run of data bytes in a single xfer, spaced by spidev's
+        # delay_usecs, rather than one xfer and sleep per byte
+        self.bulk_transfer = bulk_transfer
 
         self.reset_pin = reset_pin
         self.row_offsets = ([0x00], [0x00, 0x40], [0x00, 0x10, 0x20])[rows - 1]
         self.rows = rows
         self.columns = columns
 
-        if self.reset_pin is not None:
-            GPIO.setup(self.reset_pin,  GPIO.OUT)
-            GPIO.output(self.reset_pin, GPIO.LOW)
-            time.sleep(0.001)
-            GPIO.output(self.reset_pin, GPIO.HIGH)
-            time.sleep(0.001)
+        # DDRAM addresses in each line, display shift scrolls through
+        # them. In the 3 line layout the lines follow on from each other,
+        # a single line without the 2 line bit set spans all 80.
+        if rows == 3:
+            self.line_length = 0x10
+        elif instruction_set_template & 0b00001000:
+            self.line_length = 0x28
+        else:
+            self.line_length = 0x50
+
+        # where the address counter moves to from each DDRAM address
+        self._next_offset, self._previous_offset = address_steps(
+            rows, instruction_set_template & 0b00001000)
+
+        # columns the display has been shifted left by, see shift_left()
+        self._display_shift = 0
+        self._update_visible_offsets()
+
+        # DDRAM as we last left it on the controller, and the address counter
+        self._ddram = bytearray([DDRAM_BLANK] * DDRAM_SIZE)
+        self._cursor_offset = 0
 
-        GPIO.setup(register_select_pin, GPIO.OUT)
-        GPIO.output(register_select_pin, GPIO.HIGH)
+        # CGRAM bitmaps as uploaded, None where the contents are unknown
+        self._cgram = [None] * 8
+
+        self.framebuffer = bytearray(self._ddram) if framebuffer else None
+
+        # how write() and draw() handle characters missing from the ROM,
+        # see st7036_codec.encode()
+        self.encoding_errors = encoding_errors
 
         self.register_select_pin = register_select_pin
         self.instruction_set_template = instruction_set_template
 
+        # With a state file the display is attached to as an earlier
+        # process left it, see save_state()
+        self.state_file = state_file
+        state = self._load_state(state_file) if state_file is not None else None
+
+        if state is None and self.reset_pin is not None:
+            self.gpio.output(self.reset_pin, LOW)
+            self.timing.wait(self.timing.reset_pulse)
+            self.gpio.output(self.reset_pin, HIGH)
+            self.timing.wait(self.timing.reset_recovery)
+        elif self.reset_pin is not None:
+            # a pin set up as an output may start low, holding the
+            # controller in reset, release it without pulsing
+            self.gpio.output(self.reset_pin, HIGH)
+
+        self.gpio.output(register_select_pin, HIGH)
+
+        # Last RS level driven and function set byte sent, so neither is
+        # repeated while it is still in effect. None means unknown.
+        self._register_select = HIGH
+        self._instruction_set = None
+
+        # Shadow copy of each register as written, (value, instruction_set)
+        # keyed by name, so unchanged settings are never re-sent
+        self._registers = {}
+        self._restore_registers = {}
+
         self._enabled = True
         self._cursor_enabled = False
         self._cursor_blink = False
         self._double_height = 0
 
-        self.animations = []*8
+        # Held for every bus operation, so the animation thread can
+        # upload glyphs and put the cursor back between them
+        self.lock = threading.RLock()
 
-        self.update_display_mode()
+        self.animations = [None] * 8
+        self._animation_frames = [None] * 8
+        self._animation_thread = None
+        self._animation_stop = False
+        self._animation_wake = threading.Event()
+
+        # st7036_stats.Stats while enable_stats() is in effect
+        self.stats = None
 
-        # set entry mode (no shift, cursor direction)
-        self._write_command(0b00000100 | 0b00000010)
+        if state is not None:
+            self._attach(state, framebuffer)
+        else:
+            self.update_display_mode()
 
-        self.set_bias(1)
+            # set entry mode (no shift, cursor direction)
+            self._write_register('entry_mode', COMMAND_ENTRY_MODE | 0b00000010)
 
-        self.set_contrast(40)
-        self.clear()
+            self.set_bias(1)
+
+            self.set_contrast(40)
+            self.clear()
+
+        if state_file is not None:
+            atexit.register(self.save_state)
 
     def reset(self):
-        if self.reset_pin is not None:
-            GPIO.output(self.reset_pin, GPIO.LOW)
-            time.sleep(0.001)
-            GPIO.output(self.reset_pin, GPIO.HIGH)
+        """
+        Pulses the reset pin, if there is one.
+
+        The controller returns to its power-on settings, call restore()
+        to bring back the configuration set through this driver. Without
+        a reset pin nothing happens and what the driver knows of the
+        controller is kept.
+        """
+        if self.reset_pin is None:
+            return
+
+        self.gpio.output(self.reset_pin, LOW)
+        self.timing.wait(self.timing.reset_pulse)
+        self.gpio.output(self.reset_pin, HIGH)
+        self.timing.wait(self.timing.reset_recovery)
+
+        # the controller is back in its power-on state
+        self._register_select = None
+        self._instruction_set = None
+        self._cursor_offset = 0
+        self._ddram[:] = bytearray([DDRAM_BLANK] * DDRAM_SIZE)
+        self._cgram = [None] * 8
+        self._set_display_shift(0)
+
+        self._restore_registers.update(self._registers)
+        self._registers = dict(RESET_REGISTERS)
+
+    def restore(self):
+        """
+        Re-applies the registers lost by a reset(), grouped by instruction
+        set and sent as a single batch.
+
+        Display contents are not restored, with the framebuffer enabled
+        the next flush() redraws them.
+
+        Returns:
+            int: number of bytes sent
+        """
+        pending = [(instruction_set, name, value)
+                   for name, (value, instruction_set) in self._restore_registers.items()
+                   if self._registers.get(name) != (value, instruction_set)]
+
+        # instruction set 0 goes last to leave the controller in the default
+        # table, otherwise keep the order the registers were first written in
+        pending.sort(key=lambda register: (register[0] == 0, register[0]))
+
+        sent = self.write_commands([(value, instruction_set)
+                                    for instruction_set, name, value in pending])
+
+        for instruction_set, name, value in pending:
+            self._registers[name] = (value, instruction_set)
+        self._restore_registers = {}
+
+        return sent
+
+    def save_state(self, path=None):
+        """
+        Records the registers, DDRAM, CGRAM and framebuffer this driver
+        has set up, so the next process can attach to the display with
+        st7036(..., state_file=path) instead of resetting and clearing it.
+
+        Called at exit when the display was created with a state file.
+        Attaching consumes the file, so a process that dies without
+        saving leaves the next one to fully initialise the display. The
+        file records the kernel's boot id and is ignored after a reboot,
+        when the display has been power cycled, even if it was saved
+        cleanly.
+
+        Args:
+            path (string): where to save, defaults to the state file
+        """
+        import json
+
+        path = path or self.state_file
+        if path is None:
+            raise ValueError("no state file given")
+
+        with self.lock:
+            state = {
+                'version': STATE_VERSION,
+                'boot_id': _boot_id(),
+                'geometry': [self.rows, self.columns, self.instruction_set_template],
+                'registers': dict((name, list(register)) for name, register in self._registers.items()),
+                'display_mode': [self._enabled, self._cursor_enabled, self._cursor_blink, self._double_height],
+                'ddram': bytes(self._ddram).hex(),
+                'cursor_offset': self._cursor_offset,
+                'display_shift': self._display_shift,
+                'cgram': [None if bitmap is None else list(bitmap) for bitmap in self._cgram],
+                'framebuffer': None if self.framebuffer is None else bytes(self.framebuffer).hex(),
+            }
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        temporary = path + '.%d' % os.getpid()
+        with open(temporary, 'w') as f:
+            json.dump(state, f)
+        os.rename(temporary, path)
+
+    def _load_state(self, path):
+        import json
+
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            os.unlink(path)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if (state.get('version') != STATE_VERSION or
+                state.get('boot_id') != _boot_id() or
+                state.get('geometry') != [self.rows, self.columns, self.instruction_set_template]):
+            return None
+
+        return state
+
+    def _attach(self, state, framebuffer):
+        self._registers = dict((name, tuple(register)) for name, register in state['registers'].items())
+        self._enabled, self._cursor_enabled, self._cursor_blink, self._double_height = state['display_mode']
+
+        self._ddram[:] = bytearray.fromhex(state['ddram'])
+        self._cursor_offset = state['cursor_offset']
+        self._set_display_shift(state.get('display_shift', 0))
+        self._cgram = [None if bitmap is None else tuple(bitmap) for bitmap in state['cgram']]
+
+        if framebuffer:
+            if state['framebuffer'] is not None:
+                self.framebuffer = bytearray.fromhex(state['framebuffer'])
+            else:
+                self.framebuffer = bytearray(self._ddram)
 
     def set_bias(self, bias=1):
-        self._write_command(COMMAND_BIAS | (bias << 4) | 1, 1)
+        self._write_register('bias', COMMAND_BIAS | (bias << 4) | 1, 1)
 
     def set_contrast(self, contrast):
         """
@@ -97,11 +364,11 @@ class st7036():
 
         # For 3.3v operation the booster must be on, which is
         # on the same command as the (2-bit) high-nibble of contrast
-        self._write_command((0b01010100 | ((contrast >> 4) & 0x03)), 1)
-        self._write_command(0b01101011, 1)
+        self._write_register('power', (0b01010100 | ((contrast >> 4) & 0x03)), 1)
+        self._write_register('follower', 0b01101011, 1)
 
         # Set low-nibble of the contrast
-        self._write_command((0b01110000 | (contrast & 0x0F)), 1)
+        self._write_register('contrast', (0b01110000 | (contrast & 0x0F)), 1)
 
     def set_display_mode(self, enable=True, cursor=False, blink=False):
         """
@@ -122,7 +389,7 @@ class st7036():
         mask |= DISPLAY_ON if self._enabled else 0
         mask |= CURSOR_ON if self._cursor_enabled else 0
         mask |= BLINK_ON if self._cursor_blink else 0
-        self._write_command(mask)
+        self._write_register('display_mode', mask)
 
     def enable_cursor(self, cursor=False):
         self._cursor_enabled = cursor
@@ -157,7 +424,7 @@ class st7036():
 
         offset = self.row_offsets[row] + column
 
-        self._write_command(0b10000000 | offset)
+        self.set_cursor_offset(offset)
 
     def home(self):
         """
@@ -179,36 +446,300 @@ class st7036():
         Args:
             value (string): The string to write
         """
-        GPIO.output(self.register_select_pin, GPIO.HIGH)
+        self._write_data(st7036_codec.encode(value, self.encoding_errors))
+
+    def draw(self, column, row, value):
+        """
+        Draw a string into the framebuffer. Nothing is sent to
+        the display until flush() is called.
+
+        Text running past the end of the row is clipped.
+
+        Args:
+            column (int): column to start drawing at
+            row (int): row to draw on
+            value (string): The string to draw
+        Raises:
+            RuntimeError: if the framebuffer is not enabled
+            ValueError: if row and column are not within defined screen size
+        """
+        if self.framebuffer is None:
+            raise RuntimeError("framebuffer is not enabled")
+
+        if row not in range(self.rows) or column not in range(self.columns):
+            raise ValueError("row and column must integers within the defined screen size")
+
+        data = st7036_codec.encode(value, self.encoding_errors)[:self.columns - column]
+        offsets = self._visible_offsets[row * self.columns + column:]
+        if self._display_shift == 0:
+            self.framebuffer[offsets[0]:offsets[0] + len(data)] = data
+        else:
+            # a shifted row can wrap around the end of its DDRAM line
+            for offset, byte in zip(offsets, data):
+                self.framebuffer[offset] = byte
+
+    def clear_framebuffer(self):
+        """
+        Blanks the framebuffer. The display is cleared on the next flush().
+        """
+        if self.framebuffer is None:
+            raise RuntimeError("framebuffer is not enabled")
+
+        self.framebuffer[:] = bytearray([DDRAM_BLANK] * DDRAM_SIZE)
+
+    def flush(self):
+        """
+        Send the cells of the framebuffer that differ from the display.
+
+        Dirty cells are grouped into runs of consecutive DDRAM addresses
+        so each run costs a single cursor move, with the controller
+        auto-incrementing the address for the rest.
+
+        Returns:
+            int: number of cells sent
+        """
+        with self.lock:
+            if self.framebuffer is None:
+                raise RuntimeError("framebuffer is not enabled")
+
+            framebuffer = self.framebuffer
+            ddram = self._ddram
+            sent = 0
+            run_start = None
+            run_end = None
 
-        for byte in value.encode('st7036', errors='replace'):
-            self.spi.xfer([byte])
-            time.sleep(0.00005)
+            for offset in self._visible_offsets:
+                if framebuffer[offset] == ddram[offset]:
+                    continue
+
+                if run_start is not None and not 0 < offset - run_end <= FLUSH_RUN_GAP + 1:
+                    sent += self._flush_run(run_start, run_end)
+                    run_start = None
+
+                if run_start is None:
+                    run_start = offset
+                run_end = offset
+
+            if run_start is not None:
+                sent += self._flush_run(run_start, run_end)
+
+            return sent
+
+    def _flush_run(self, start, end):
+        if self._cursor_offset != start:
+            self.set_cursor_offset(start)
+        self._write_data(self.framebuffer[start:end + 1])
+        return end + 1 - start
 
     def create_animation(self, anim_pos, anim_map, frame_rate):
-        self.create_char(anim_pos, anim_map[0])
-        self.animations[anim_pos] = [anim_map, frame_rate]
-        self.set_cursor_position(0, 1)
-
-    def update_animations(self):
-        for i, animation in enumerate(self.animations):
-            if len(animation) == 2:
-                anim = animation[0]
-                fps = animation[1]
-                frame = anim[int(round(time.time()*fps) % len(anim))]
-                self.create_char(i, frame)
-        self.set_cursor_position(0, 1)
+        """
+        Animates a custom character by cycling it through a list of frames.
+
+        Args:
+            anim_pos (int): slot to animate, 0..7
+            anim_map (list): char_map for each frame
+            frame_rate (float): frames per second
+        """
+        with self.lock:
+            self.animations[anim_pos] = [anim_map, frame_rate]
+            self._animation_frames[anim_pos] = 0
+            self.create_char(anim_pos, anim_map[0])
+
+        # let a running animation thread pick up the new deadline
+        self._animation_wake.set()
+
+    def remove_animation(self, anim_pos):
+        """
+        Stops animating a custom character, leaving its current frame shown.
+        """
+        with self.lock:
+            self.animations[anim_pos] = None
+            self._animation_frames[anim_pos] = None
+
+    def update_animations(self, now=None):
+        """
+        Uploads the current frame of every animation whose frame has
+        changed since the last update. The cursor is left where it was.
+
+        Args:
+            now (float): time to compute frames for, defaults to time.time()
+        Returns:
+            float: time at which the next frame is due, or None if there
+                are no animations
+        """
+        if now is None:
+            now = time.time()
+
+        with self.lock:
+            frames = {}
+            deadline = None
+
+            for i, animation in enumerate(self.animations):
+                if animation is None:
+                    continue
+
+                anim, fps = animation
+                tick = int(round(now * fps))
+                frame = tick % len(anim)
+                if frame != self._animation_frames[i]:
+                    frames[i] = anim[frame]
+                    self._animation_frames[i] = frame
+
+                # round() moves to the next frame half way between ticks
+                due = (tick + 0.5) / fps
+                if deadline is None or due < deadline:
+                    deadline = due
+
+            self.create_chars(frames)
+
+        return deadline
+
+    def start_animations(self):
+        """
+        Runs update_animations() on a background thread, sleeping until
+        the next frame of any animation is due.
+        """
+        if self._animation_thread is not None:
+            return
+
+        self._animation_stop = False
+        self._animation_thread = threading.Thread(target=self._run_animations)
+        self._animation_thread.daemon = True
+        self._animation_thread.start()
+
+    def stop_animations(self):
+        """
+        Stops the background animation thread.
+        """
+        if self._animation_thread is None:
+            return
+
+        self._animation_stop = True
+        self._animation_wake.set()
+        self._animation_thread.join()
+        self._animation_thread = None
+
+    def _run_animations(self):
+        while not self._animation_stop:
+            deadline = self.update_animations()
+            timeout = None if deadline is None else max(0, deadline - time.time())
+            self._animation_wake.wait(timeout)
+            self._animation_wake.clear()
 
     def create_char(self, char_pos, char_map):
+        """
+        Uploads a custom character to one of the 8 CGRAM slots.
+
+        Nothing is sent if the slot already holds the same bitmap.
+
+        Args:
+            char_pos (int): slot to upload to, 0..7
+            char_map (list): 8 rows of 5-bit pixel data
+        Raises:
+            ValueError: if char_map does not have 8 rows
+        """
         if char_pos < 0 or char_pos > 7:
             return False
 
-        baseAddress = char_pos*8
-        for i in range(0, 8):
-            self._write_command((0x40 | (baseAddress+i)))
-            self._write_char(char_map[i])
+        self.create_chars({char_pos: char_map})
+
+    def create_chars(self, char_maps, char_pos=0):
+        """
+        Uploads several custom characters at once.
+
+        Each run of consecutive slots is sent as one CGRAM address
+        command followed by a single data burst, relying on the address
+        counter to auto-increment. Slots that already hold the same
+        bitmap are skipped.
+
+        Args:
+            char_maps (dict): char_map for each slot, or a list of
+                char_maps for consecutive slots starting at char_pos
+            char_pos (int): first slot when char_maps is a list
+        Returns:
+            int: number of slots uploaded
+        Raises:
+            ValueError: if a slot is not in the range 0..7, or a char_map
+                does not have 8 rows
+        """
+        with self.lock:
+            if not isinstance(char_maps, dict):
+                char_maps = dict(enumerate(char_maps, char_pos))
+
+            bitmaps = {}
+            for position, char_map in char_maps.items():
+                if position not in range(8):
+                    raise ValueError("char_pos must be an integer in the range 0..7")
+                bitmap = tuple(char_map)
+                if len(bitmap) != 8:
+                    # a run relies on 8 bytes per slot, a short map would
+                    # shift the rows of every later slot
+                    raise ValueError("char_map must have 8 rows")
+                if self._cgram[position] != bitmap:
+                    bitmaps[position] = bitmap
+
+            if not bitmaps:
+                return 0
+
+            cursor_offset = self._cursor_offset
+
+            run = []
+            for position in sorted(bitmaps):
+                if run and position != run[-1] + 1:
+                    self._upload_chars(run, bitmaps)
+                    run = []
+                run.append(position)
+            self._upload_chars(run, bitmaps)
+
+            # point the address counter back into DDRAM where it was
+            if cursor_offset is not None:
+                self.set_cursor_offset(cursor_offset)
+
+            return len(bitmaps)
+
+    def _upload_chars(self, positions, bitmaps):
+        self._write_command(0x40 | (positions[0] * 8))
+
+        data = []
+        for position in positions:
+            data.extend(bitmaps[position])
+            self._cgram[position] = bitmaps[position]
+
+        self._write_data(data, self.timing.cgram)
+
+    def visible_bytes(self):
+        """
+        Returns the character codes currently shown on the display, row
+        by row, as last written by this driver.
+        """
+        ddram = self._ddram
+        return bytes(ddram[offset] for offset in self._visible_offsets)
+
+    def enable_stats(self):
+        """
+        Starts counting calls, bus traffic, delays and latencies for this
+        display, see st7036_stats. Without stats enabled the driver runs
+        uninstrumented.
+
+        Returns:
+            Stats: the counters, also kept in the stats attribute
+        """
+        import st7036_stats
+
+        with self.lock:
+            if self.stats is None:
+                self.stats = st7036_stats.Stats()
+                self.stats.attach(self)
+            return self.stats
 
-        self.set_display_mode()
+    def disable_stats(self):
+        """
+        Stops counting and removes the instrumentation.
+        """
+        with self.lock:
+            if self.stats is not None:
+                self.stats.detach()
+                self.stats = None
 
     def cursor_left(self):
         self._write_command(COMMAND_SCROLL, 0)
@@ -222,39 +753,300 @@ class st7036():
     def shift_right(self):
         self._write_command(COMMAND_SCROLL | (1 << 3) | (1 << 2), 0) # 0x1C
 
+    @property
+    def display_shift(self):
+        """
+        Columns the display is shifted left by, 0 to line_length - 1.
+        Shifting moves every row, draw(), flush(), visible_bytes() and
+        cell_offset() follow it, set_cursor_position(), set_cursor_offset()
+        and write() address DDRAM as is.
+        """
+        return self._display_shift
+
+    @property
+    def page_count(self):
+        """
+        Screens that fit side by side in each DDRAM line, 1 for the
+        3 line layout. Page n starts n * columns into every line.
+        """
+        return self.line_length // self.columns
+
+    @property
+    def page(self):
+        """
+        Page on screen, None while the display is shifted part way
+        between pages.
+        """
+        page, part = divmod(self._display_shift, self.columns)
+        return page if part == 0 and page < self.page_count else None
+
+    def show_page(self, page):
+        """
+        Brings a page into view with display shift commands, sent in one
+        transfer the shortest way round the line. Nothing in DDRAM is
+        rewritten, so switching takes the same time however much of the
+        screen changes.
+
+        Args:
+            page (int): page to show
+        Returns:
+            int: number of command bytes sent
+        Raises:
+            ValueError: if there is no such page
+        """
+        if page not in range(self.page_count):
+            raise ValueError("page must be within the %d pages that fit in DDRAM" % self.page_count)
+
+        with self.lock:
+            left = (page * self.columns - self._display_shift) % self.line_length
+            right = self.line_length - left if left else 0
+
+            if page == 0 and self.timing.clear < min(left, right) * self.timing.command:
+                # return home undoes any shift in one, slower, command
+                return self.write_commands([COMMAND_HOME])
+            if left <= right:
+                return self.write_commands([COMMAND_SHIFT] * left)
+            return self.write_commands([COMMAND_SHIFT | 0b00000100] * right)
+
+    def write_page(self, page, column, row, value):
+        """
+        Writes a string to a page, shown or not, leaving the cursor
+        after it. Only the characters that differ from what DDRAM holds
+        are sent, and text running past the end of the row is clipped.
+
+        With the framebuffer enabled the text is drawn into it as well,
+        so flush() keeps it when the page is shown.
+
+        Args:
+            page (int): page to write to
+            column (int): column within the page
+            row (int): row to write on
+            value (string): The string to write
+        Returns:
+            int: number of characters sent
+        Raises:
+            ValueError: if the page, row or column does not exist
+        """
+        if page not in range(self.page_count):
+            raise ValueError("page must be within the %d pages that fit in DDRAM" % self.page_count)
+        if row not in range(self.rows) or column not in range(self.columns):
+            raise ValueError("row and column must integers within the defined screen size")
+
+        data = bytearray(st7036_codec.encode(value, self.encoding_errors)[:self.columns - column])
+        start = self.row_offsets[row] + page * self.columns + column
+
+        with self.lock:
+            if self.framebuffer is not None:
+                self.framebuffer[start:start + len(data)] = data
+
+            changed = [i for i, byte in enumerate(data) if self._ddram[start + i] != byte]
+            if not changed:
+                return 0
+
+            first, last = changed[0], changed[-1] + 1
+            self.set_cursor_offset(start + first)
+            self._write_data(data[first:last])
+            return last - first
+
+    def cell_offset(self, column, row):
+        """
+        Returns the DDRAM address shown at a column and row, following the
+        display shift like draw() does.
+
+        Raises:
+            ValueError: if row and column are not within defined screen size
+        """
+        if row not in range(self.rows) or column not in range(self.columns):
+            raise ValueError("row and column must integers within the defined screen size")
+
+        return self._visible_offsets[row * self.columns + column]
+
+    def _set_display_shift(self, shift):
+        shift %= self.line_length
+        if shift != self._display_shift:
+            self._display_shift = shift
+            self._update_visible_offsets()
+
+    def _update_visible_offsets(self):
+        self._visible_offsets = [offset + (column + self._display_shift) % self.line_length
+                                 for offset in self.row_offsets
+                                 for column in range(self.columns)]
+
     def double_height(self, enable=0, position=1):
         self._double_height = enable
         self._write_instruction_set(0)
-        self._write_command(COMMAND_DOUBLE | (position << 3), 2)
+        self._write_register('double_height', COMMAND_DOUBLE | (position << 3), 2)
+
+    def compile_commands(self, commands):
+        """
+        Compile a list of commands into the bytes that would send them,
+        starting from the controller's current instruction set.
+
+        An instruction set switch is only inserted in front of a command
+        when the controller is not already using that table.
+
+        Args:
+            commands (list): command bytes, or (command, instruction_set)
+                tuples for commands outside instruction set 0
+        Returns:
+            list: the command bytes, including any instruction set switches
+        """
+        data = []
+        current = self._instruction_set
+
+        for command in commands:
+            value, instruction_set = command if isinstance(command, tuple) else (command, 0)
 
-    def _write_char(self, value):
-        GPIO.output(self.register_select_pin, GPIO.HIGH)
-        self.spi.xfer([value])
+            function_set = self._function_set(instruction_set)
+            if function_set != current:
+                data.append(function_set)
+                current = function_set
 
-        time.sleep(0.0001)
+            data.append(value)
+
+        return data
+
+    def write_commands(self, commands):
+        """
+        Send a list of commands in a single SPI transfer.
+
+        Args:
+            commands (list): command bytes, or (command, instruction_set)
+                tuples for commands outside instruction set 0
+        Returns:
+            int: number of bytes sent
+        """
+        with self.lock:
+            data = self.compile_commands(commands)
+            if not data:
+                return 0
+
+            self._set_register_select(LOW)
+
+            # clear and home take far longer than other commands, end
+            # the transfer after each one to wait for it separately
+            start = 0
+            for end, value in enumerate(data, 1):
+                if self._command_delay(value) > self.timing.command or end == len(data):
+                    self._transfer(data[start:end], self.timing.command)
+                    self.timing.wait(self._command_delay(value) - self.timing.command)
+                    start = end
+
+            for value in data:
+                if value & 0b11100000 == 0b00100000:
+                    self._instruction_set = value
+                else:
+                    self._track_command(value, self._instruction_set & 0b11)
+
+            return len(data)
+
+    def _write_data(self, data, delay=None):
+        if delay is None:
+            delay = self.timing.data
+
+        with self.lock:
+            self._set_register_select(HIGH)
+
+            if self.bulk_transfer:
+                for start in range(0, len(data), BULK_TRANSFER_SIZE):
+                    # spidev takes a list, one is built per burst
+                    self._transfer(list(data[start:start + BULK_TRANSFER_SIZE]), delay)
+            else:
+                for byte in data:
+                    self.spi.xfer([byte])
+                    self.timing.wait(delay)
+
+            # keep track of what landed in DDRAM
+            offset = self._cursor_offset
+            if offset is not None:
+                ddram = self._ddram
+                next_offset = self._next_offset
+                for byte in data:
+                    ddram[offset] = byte
+                    offset = next_offset[offset]
+                self._cursor_offset = offset
+
+    def _set_register_select(self, level):
+        if self._register_select != level:
+            self.gpio.output(self.register_select_pin, level)
+            self._register_select = level
+
+    def _function_set(self, instruction_set=0):
+        return self.instruction_set_template | instruction_set | (self._double_height << 2)
 
     def _write_instruction_set(self, instruction_set=0):
-        GPIO.output(self.register_select_pin, GPIO.LOW)
-        self.spi.xfer([self.instruction_set_template | instruction_set | (self._double_height << 2)])
-        time.sleep(0.00006)
+        function_set = self._function_set(instruction_set)
+        if function_set == self._instruction_set:
+            return
 
-    def _write_command(self, value, instruction_set=0):
-        GPIO.output(self.register_select_pin, GPIO.LOW)
+        self._set_register_select(LOW)
+        self._transfer([function_set], self.timing.command)
 
-        # select correct instruction set
-        self._write_instruction_set(instruction_set)
+        self._instruction_set = function_set
 
-        # switch to command-mode
-        self.spi.xfer([value])
+    def _write_register(self, name, value, instruction_set=0):
+        register = (value, instruction_set)
+        if self._registers.get(name) == register:
+            return False
 
-        time.sleep(0.00006)
+        self._write_command(value, instruction_set)
+        self._registers[name] = register
+        return True
+
+    def _write_command(self, value, instruction_set=0):
+        with self.lock:
+            # select correct instruction set
+            self._write_instruction_set(instruction_set)
+
+            # switch to command-mode
+            self._set_register_select(LOW)
+            self._transfer([value], self._command_delay(value))
+
+            self._track_command(value, instruction_set)
+
+    def _command_delay(self, value):
+        if value == COMMAND_CLEAR or value & 0b11111110 == COMMAND_HOME:
+            return self.timing.clear
+        return self.timing.command
+
+    def _transfer(self, data, delay):
+        # spidev spaces the bytes of a multi-byte transfer itself, single
+        # bytes are left to the profile's strategy
+        if len(data) > 1 or self.timing.strategy == st7036_timing.SPIDEV:
+            self.spi.xfer(data, self.spi.max_speed_hz, self.timing.usecs(delay))
+        else:
+            self.spi.xfer(data)
+            self.timing.wait(delay)
+
+    def _track_command(self, value, instruction_set):
+        # follow the effect of a command on the address counter and DDRAM
+        if value & 0b10000000:
+            self._cursor_offset = value & 0b01111111
+        elif value & 0b01000000:
+            if instruction_set == 0:
+                # the address counter now points into CGRAM
+                self._cursor_offset = None
+        elif value & 0b11111000 == COMMAND_SCROLL:
+            if instruction_set == 0 and self._cursor_offset is not None:
+                steps = self._next_offset if value & 0b00000100 else self._previous_offset
+                self._cursor_offset = steps[self._cursor_offset]
+        elif value & 0b11111000 == COMMAND_SHIFT:
+            if instruction_set == 0:
+                step = -1 if value & 0b00000100 else 1
+                self._set_display_shift(self._display_shift + step)
+        elif value == COMMAND_CLEAR:
+            self._ddram[:] = bytearray([DDRAM_BLANK] * DDRAM_SIZE)
+            self._cursor_offset = 0
+            self._set_display_shift(0)
+        elif value & 0b11111110 == COMMAND_HOME:
+            # return home also undoes any display shift
+            self._cursor_offset = 0
+            self._set_display_shift(0)
 
 if __name__ == "__main__":
     print("st7036 test cycles")
 
-    import time
     import sys
-    import os
     import random
 
     # disable output buffering for our test activity dots
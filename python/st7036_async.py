@@ -0,0 +1,128 @@
+"""
+asyncio front end for the st7036 driver, Python 3.5 or later.
+
+Bus work, with its inter-byte delays, runs on a single executor thread
+per display, so awaiting a write never blocks the event loop and calls
+reach the display in the order they were made.
+"""
+
+import asyncio
+import functools
+import operator
+from concurrent.futures import ThreadPoolExecutor
+
+import st7036
+
+
+class AsyncST7036(object):
+    """
+    Wraps an st7036 display with awaitable methods.
+
+    Each call is one job on the display's executor thread, so calls from
+    different tasks never interleave within a call. Use write_at() or
+    call() where a cursor move and a write must stay together.
+
+    Methods are looked up on the display instance, so per-display
+    wrappers such as enable_stats() see every call.
+    """
+    def __init__(self, lcd, executor=None):
+        """
+        Args:
+            lcd (st7036): display to drive
+            executor (Executor): where bus work runs, defaults to a new
+                single thread executor. It must run one job at a time.
+        """
+        self.lcd = lcd
+        self._own_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+
+    @classmethod
+    async def open(cls, *args, **kwargs):
+        """
+        Creates the display on the executor thread, as initialising it
+        waits out reset and clear delays. Takes st7036() arguments.
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_event_loop()
+        lcd = await loop.run_in_executor(executor, functools.partial(st7036.st7036, *args, **kwargs))
+        display = cls(lcd, executor)
+        display._own_executor = True
+        return display
+
+    async def call(self, function, *args, **kwargs):
+        """
+        Runs function(lcd, *args, **kwargs) on the executor thread, with
+        nothing else touching the display until it returns.
+
+        Returns:
+            whatever function returns
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, self.lcd, *args, **kwargs))
+
+    async def write(self, value):
+        return await self.call(operator.methodcaller('write', value))
+
+    async def write_at(self, column, row, value):
+        """
+        Moves the cursor and writes value as a single call.
+        """
+        return await self.call(_write_at, column, row, value)
+
+    async def set_cursor_position(self, column, row):
+        return await self.call(operator.methodcaller('set_cursor_position', column, row))
+
+    async def set_cursor_offset(self, offset):
+        return await self.call(operator.methodcaller('set_cursor_offset', offset))
+
+    async def clear(self):
+        return await self.call(operator.methodcaller('clear'))
+
+    async def set_contrast(self, contrast):
+        return await self.call(operator.methodcaller('set_contrast', contrast))
+
+    async def set_display_mode(self, enable=True, cursor=False, blink=False):
+        return await self.call(operator.methodcaller('set_display_mode', enable, cursor, blink))
+
+    async def create_char(self, char_pos, char_map):
+        return await self.call(operator.methodcaller('create_char', char_pos, char_map))
+
+    async def create_chars(self, char_maps, char_pos=0):
+        return await self.call(operator.methodcaller('create_chars', char_maps, char_pos))
+
+    def draw(self, column, row, value):
+        """
+        Draws into the framebuffer, which is only memory so there is
+        nothing to await. Text drawn while a flush is running may be
+        left for the next flush.
+        """
+        self.lcd.draw(column, row, value)
+
+    async def flush(self):
+        """
+        Sends the framebuffer cells that changed.
+
+        Returns:
+            int: number of cells sent
+        """
+        return await self.call(operator.methodcaller('flush'))
+
+    async def close(self):
+        """
+        Waits for queued calls to finish and shuts down the executor if
+        this wrapper created it.
+        """
+        if self._own_executor:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+def _write_at(lcd, column, row, value):
+    lcd.set_cursor_position(column, row)
+    lcd.write(value)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""
+Measures the bus traffic and time taken by typical display workloads,
+run against st7036_transport.FakeTransport so no hardware is needed.
+
+    python st7036_benchmark.py [--iterations N] [--json FILE] [--compare FILE]
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+import st7036
+import st7036_timing
+import st7036_transport
+
+
+class RecordingTiming(st7036_timing.TimingProfile):
+    """
+    A timing profile that adds up the delays it is asked for instead of
+    waiting, so workloads run at full speed.
+    """
+    def __init__(self, profile=st7036_timing.DATASHEET):
+        st7036_timing.TimingProfile.__init__(self,
+                                             data=profile.data,
+                                             command=profile.command,
+                                             clear=profile.clear,
+                                             cgram=profile.cgram,
+                                             reset_pulse=profile.reset_pulse,
+                                             reset_recovery=profile.reset_recovery,
+                                             strategy=profile.strategy,
+                                             max_speed_hz=profile.max_speed_hz)
+        self.requested = 0.0
+
+    def wait(self, seconds):
+        self.requested += seconds
+
+
+def full_redraw(lcd, i):
+    lcd.set_cursor_offset(0x00)
+    lcd.write("".join(chr(65 + (i + j) % 26) for j in range(lcd.rows * lcd.columns)))
+
+
+def full_redraw_framebuffer(lcd, i):
+    for row in range(lcd.rows):
+        lcd.draw(0, row, "".join(chr(65 + (i + row + j) % 26) for j in range(lcd.columns)))
+    lcd.flush()
+
+
+def single_cell(lcd, i):
+    lcd.set_cursor_position(i % lcd.columns, i % lcd.rows)
+    lcd.write(chr(65 + i % 26))
+
+
+def clock_tick(lcd, i):
+    lcd.draw(4, 0, time.strftime("%H:%M:%S", time.gmtime(i)))
+    lcd.flush()
+
+
+ANIMATIONS = [[[(frame + slot + row) % 32 for row in range(8)] for frame in range(4)]
+              for slot in range(8)]
+
+
+def animation_cycle(lcd, i):
+    if i == 0:
+        for slot, frames in enumerate(ANIMATIONS):
+            lcd.create_animation(slot, frames, 4)
+    lcd.update_animations(now=i / 4.0)
+
+
+def contrast_sweep(lcd, i):
+    step = i % 0x80
+    lcd.set_contrast(step if step < 0x40 else 0x7F - step)
+
+
+SYSINFO_LEVELS = [[0] * 7 + [31], [0] * 5 + [31, 0, 0], [0] * 4 + [31, 0, 0, 0],
+                  [0, 0, 31, 0, 0, 0, 0, 0], [0, 31, 0, 0, 0, 0, 0, 0]]
+SYSINFO_STEPS = [0, 95, 1, 2, 45, 3, 4, 255]
+
+
+def sysinfo(lcd, i):
+    # the bar graph from examples/sysinfo.py, redrawn every 250ms
+    if i == 0:
+        lcd.create_chars(SYSINFO_LEVELS)
+        lcd.history = []
+
+    cpu = 50 + 50 * math.sin(i / 5.0)
+    lcd.set_cursor_position(0, 1)
+    lcd.write("CPU% " + str(round(cpu, 2)) + '    ')
+
+    lcd.history.append(SYSINFO_STEPS[int(math.floor((7.0 / 100.0) * cpu))])
+    if len(lcd.history) > lcd.columns:
+        lcd.history.pop(0)
+
+    lcd.set_cursor_position(0, 2)
+    lcd.write("".join(chr(level) for level in lcd.history))
+
+
+WORKLOADS = [
+    ('full_redraw', full_redraw, {}),
+    ('full_redraw_framebuffer', full_redraw_framebuffer, {'framebuffer': True}),
+    ('single_cell', single_cell, {}),
+    ('clock_tick', clock_tick, {'framebuffer': True}),
+    ('animation_cycle', animation_cycle, {}),
+    ('contrast_sweep', contrast_sweep, {}),
+    ('sysinfo', sysinfo, {}),
+]
+
+
+def run(workload, iterations=100, **options):
+    """
+    Runs a workload against a fresh display on a fake transport.
+
+    Args:
+        workload (callable): called as workload(lcd, iteration)
+        iterations (int): number of times to call it
+        options: extra arguments for st7036()
+    Returns:
+        dict: totals for the whole run
+    """
+    transport = st7036_transport.FakeTransport()
+    timing = RecordingTiming()
+    lcd = st7036.st7036(register_select_pin=25, transport=transport, timing=timing, **options)
+
+    # leave initialisation out of the numbers
+    transport.clear()
+    timing.requested = 0.0
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        workload(lcd, i)
+    wall = time.perf_counter() - start
+
+    spi_delay = sum(delay_usecs * len(data)
+                    for register_select, data, delay_usecs, timestamp in transport.transfers)
+
+    return {
+        'iterations': iterations,
+        'spi_bytes': len(transport.events),
+        'transactions': len(transport.transfers),
+        'gpio_toggles': len(transport.outputs),
+        'sleep_s': timing.requested,
+        'spi_delay_s': spi_delay / 1000000.0,
+        'wall_s': wall,
+    }
+
+
+def run_all(iterations=100):
+    """
+    Runs every workload.
+
+    Returns:
+        dict: machine-readable results, keyed by workload under 'results'
+    """
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': time.time(),
+        'iterations': iterations,
+        'results': dict((name, run(workload, iterations, **options))
+                        for name, workload, options in WORKLOADS),
+    }
+
+
+COLUMNS = ['spi_bytes', 'transactions', 'gpio_toggles', 'sleep_s', 'spi_delay_s', 'wall_s']
+
+
+def report(results, baseline=None, out=sys.stdout):
+    out.write("%-24s" % "workload" + "".join("%14s" % column for column in COLUMNS) + "\n")
+    for name, result in sorted(results['results'].items()):
+        out.write("%-24s" % name)
+        for column in COLUMNS:
+            value = result[column]
+            cell = ("%.6f" if isinstance(value, float) else "%d") % value
+            if baseline is not None and name in baseline['results']:
+                before = baseline['results'][name][column]
+                if before:
+                    cell += " %+d%%" % round(100.0 * (value - before) / before)
+            out.write("%14s" % cell)
+        out.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="st7036 driver benchmarks")
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--compare', help="show changes against earlier --json results")
+    args = parser.parse_args()
+
+    results = run_all(args.iterations)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report(results, baseline)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
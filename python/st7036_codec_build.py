@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Generates st7036_codec_table.py from the UNICODE_MAP file at the top of
+the repository.
+
+    python3 st7036_codec_build.py           # regenerate the table
+    python3 st7036_codec_build.py --check   # fail if the two have drifted
+"""
+
+import argparse
+import os
+import sys
+import unicodedata
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+UNICODE_MAP = os.path.join(HERE, os.pardir, 'UNICODE_MAP')
+TABLE = os.path.join(HERE, 'st7036_codec_table.py')
+
+HEADER = '''\
+# Generated from UNICODE_MAP by st7036_codec_build.py, do not edit.
+#
+# Character table for the ST7036 ROM in the form codecs.charmap_decode()
+# takes directly, with the matching encoding table built by
+# codecs.charmap_build() in C at import.
+
+import codecs
+
+decoding_table = (
+'''
+
+FOOTER = '''\
+)
+
+encoding_table = codecs.charmap_build(decoding_table)
+'''
+
+# Keeps the old behaviour of codecs.make_encoding_map(), which leaves
+# characters the ROM has more than once unmapped
+DUPLICATES = '''
+# Characters the ROM has more than once are left unmapped
+encoding_table.update({%s})
+'''
+
+
+def read_unicode_map(path=UNICODE_MAP):
+    """
+    Reads UNICODE_MAP, one "<code in binary>\\tU+<hex>\\t<name>" line per
+    ROM character.
+
+    Returns:
+        list: (code_point, name) for each of the 256 ROM codes
+    Raises:
+        ValueError: if the file is malformed or incomplete
+    """
+    table = [None] * 256
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line:
+                continue
+
+            try:
+                code, code_point, name = line.split('\t')
+                code = int(code, 2)
+                if not code_point.startswith('U+'):
+                    raise ValueError
+                code_point = int(code_point[2:], 16)
+            except ValueError:
+                raise ValueError("%s:%d: malformed line %r" % (path, number, line))
+
+            if table[code] is not None:
+                raise ValueError("%s:%d: code %d listed twice" % (path, number, code))
+
+            expected = unicodedata.name(chr(code_point), None)
+            if expected is not None and expected != name:
+                raise ValueError("%s:%d: U+%04X is %s, not %s" % (path, number, code_point, expected, name))
+
+            table[code] = (code_point, name)
+
+    missing = [code for code, entry in enumerate(table) if entry is None]
+    if missing:
+        raise ValueError("%s: no entry for codes %r" % (path, missing))
+
+    return table
+
+
+def generate(table):
+    lines = [HEADER]
+    for code, (code_point, name) in enumerate(table):
+        if code_point > 0xFFFF:
+            literal = "'\\U%08x'" % code_point
+        else:
+            literal = "'\\u%04x'" % code_point
+        lines.append("    %-12s # 0x%02X %s\n" % (literal, code, name))
+    lines.append(FOOTER)
+
+    code_points = [code_point for code_point, name in table]
+    duplicates = sorted(set(code_point for code_point in code_points
+                            if code_points.count(code_point) > 1))
+    if duplicates:
+        lines.append(DUPLICATES % ", ".join("0x%04X: None" % code_point for code_point in duplicates))
+    return ''.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="build st7036_codec_table.py from UNICODE_MAP")
+    parser.add_argument('--check', action='store_true',
+                        help="exit with an error if st7036_codec_table.py is out of date")
+    args = parser.parse_args()
+
+    source = generate(read_unicode_map())
+
+    if args.check:
+        try:
+            with open(TABLE) as f:
+                current = f.read()
+        except IOError:
+            current = None
+        if current != source:
+            sys.stderr.write("st7036_codec_table.py does not match UNICODE_MAP, "
+                             "run st7036_codec_build.py\n")
+            return 1
+        return 0
+
+    with open(TABLE, 'w') as f:
+        f.write(source)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+# Generated from UNICODE_MAP by st7036_codec_build.py, do not edit.
+#
+# Character table for the ST7036 ROM in the form codecs.charmap_decode()
+# takes directly, with the matching encoding table built by
+# codecs.charmap_build() in C at import.
+
+import codecs
+
+decoding_table = (
+    '\U000eff80' # 0x00 USER DEFINED CHARACTER 0
+    '\U000eff81' # 0x01 USER DEFINED CHARACTER 1
+    '\U000eff82' # 0x02 USER DEFINED CHARACTER 2
+    '\U000eff83' # 0x03 USER DEFINED CHARACTER 3
+    '\U000eff84' # 0x04 USER DEFINED CHARACTER 4
+    '\U000eff85' # 0x05 USER DEFINED CHARACTER 5
+    '\U000eff86' # 0x06 USER DEFINED CHARACTER 6
+    '\U000eff87' # 0x07 USER DEFINED CHARACTER 7
+    '\u2190'     # 0x08 LEFTWARDS ARROW
+    '\u250c'     # 0x09 BOX DRAWINGS LIGHT DOWN AND RIGHT
+    '\u2510'     # 0x0A BOX DRAWINGS LIGHT DOWN AND LEFT
+    '\u2514'     # 0x0B BOX DRAWINGS LIGHT UP AND RIGHT
+    '\u2518'     # 0x0C BOX DRAWINGS LIGHT UP AND LEFT
+    '\u00b7'     # 0x0D MIDDLE DOT
+    '\u00ae'     # 0x0E REGISTERED SIGN
+    '\u00a9'     # 0x0F COPYRIGHT SIGN
+    '\u2122'     # 0x10 TRADE MARK SIGN
+    '\u2020'     # 0x11 DAGGER
+    '\u00a7'     # 0x12 SECTION SIGN
+    '\u00b6'     # 0x13 PILCROW SIGN
+    '\u0393'     # 0x14 GREEK CAPITAL LETTER GAMMA
+    '\u0394'     # 0x15 GREEK CAPITAL LETTER DELTA
+    '\u0398'     # 0x16 GREEK CAPITAL LETTER THETA
+    '\u039b'     # 0x17 GREEK CAPITAL LETTER LAMDA
+    '\u039e'     # 0x18 GREEK CAPITAL LETTER XI
+    '\u03a0'     # 0x19 GREEK CAPITAL LETTER PI
+    '\u03a3'     # 0x1A GREEK CAPITAL LETTER SIGMA
+    '\u03d2'     # 0x1B GREEK UPSILON WITH HOOK SYMBOL
+    '\u03a6'     # 0x1C GREEK CAPITAL LETTER PHI
+    '\u03a8'     # 0x1D GREEK CAPITAL LETTER PSI
+    '\u03a9'     # 0x1E GREEK CAPITAL LETTER OMEGA
+    '\u03b1'     # 0x1F GREEK SMALL LETTER ALPHA
+    '\u0020'     # 0x20 SPACE
+    '\u0021'     # 0x21 EXCLAMATION MARK
+    '\u0022'     # 0x22 QUOTATION MARK
+    '\u0023'     # 0x23 NUMBER SIGN
+    '\u0024'     # 0x24 DOLLAR SIGN
+    '\u0025'     # 0x25 PERCENT SIGN
+    '\u0026'     # 0x26 AMPERSAND
+    '\u0027'     # 0x27 APOSTROPHE
+    '\u0028'     # 0x28 LEFT PARENTHESIS
+    '\u0029'     # 0x29 RIGHT PARENTHESIS
+    '\u002a'     # 0x2A ASTERISK
+    '\u002b'     # 0x2B PLUS SIGN
+    '\u002c'     # 0x2C COMMA
+    '\u002d'     # 0x2D HYPHEN-MINUS
+    '\u002e'     # 0x2E FULL STOP
+    '\u002f'     # 0x2F SOLIDUS
+    '\u0030'     # 0x30 DIGIT ZERO
+    '\u0031'     # 0x31 DIGIT ONE
+    '\u0032'     # 0x32 DIGIT TWO
+    '\u0033'     # 0x33 DIGIT THREE
+    '\u0034'     # 0x34 DIGIT FOUR
+    '\u0035'     # 0x35 DIGIT FIVE
+    '\u0036'     # 0x36 DIGIT SIX
+    '\u0037'     # 0x37 DIGIT SEVEN
+    '\u0038'     # 0x38 DIGIT EIGHT
+    '\u0039'     # 0x39 DIGIT NINE
+    '\u003a'     # 0x3A COLON
+    '\u003b'     # 0x3B SEMICOLON
+    '\u003c'     # 0x3C LESS-THAN SIGN
+    '\u003d'     # 0x3D EQUALS SIGN
+    '\u003e'     # 0x3E GREATER-THAN SIGN
+    '\u003f'     # 0x3F QUESTION MARK
+    '\u0040'     # 0x40 COMMERCIAL AT
+    '\u0041'     # 0x41 LATIN CAPITAL LETTER A
+    '\u0042'     # 0x42 LATIN CAPITAL LETTER B
+    '\u0043'     # 0x43 LATIN CAPITAL LETTER C
+    '\u0044'     # 0x44 LATIN CAPITAL LETTER D
+    '\u0045'     # 0x45 LATIN CAPITAL LETTER E
+    '\u0046'     # 0x46 LATIN CAPITAL LETTER F
+    '\u0047'     # 0x47 LATIN CAPITAL LETTER G
+    '\u0048'     # 0x48 LATIN CAPITAL LETTER H
+    '\u0049'     # 0x49 LATIN CAPITAL LETTER I
+    '\u004a'     # 0x4A LATIN CAPITAL LETTER J
+    '\u004b'     # 0x4B LATIN CAPITAL LETTER K
+    '\u004c'     # 0x4C LATIN CAPITAL LETTER L
+    '\u004d'     # 0x4D LATIN CAPITAL LETTER M
+    '\u004e'     # 0x4E LATIN CAPITAL LETTER N
+    '\u004f'     # 0x4F LATIN CAPITAL LETTER O
+    '\u0050'     # 0x50 LATIN CAPITAL LETTER P
+    '\u0051'     # 0x51 LATIN CAPITAL LETTER Q
+    '\u0052'     # 0x52 LATIN CAPITAL LETTER R
+    '\u0053'     # 0x53 LATIN CAPITAL LETTER S
+    '\u0054'     # 0x54 LATIN CAPITAL LETTER T
+    '\u0055'     # 0x55 LATIN CAPITAL LETTER U
+    '\u0056'     # 0x56 LATIN CAPITAL LETTER V
+    '\u0057'     # 0x57 LATIN CAPITAL LETTER W
+    '\u0058'     # 0x58 LATIN CAPITAL LETTER X
+    '\u0059'     # 0x59 LATIN CAPITAL LETTER Y
+    '\u005a'     # 0x5A LATIN CAPITAL LETTER Z
+    '\u005b'     # 0x5B LEFT SQUARE BRACKET
+    '\u005c'     # 0x5C REVERSE SOLIDUS
+    '\u005d'     # 0x5D RIGHT SQUARE BRACKET
+    '\u005e'     # 0x5E CIRCUMFLEX ACCENT
+    '\u005f'     # 0x5F LOW LINE
+    '\u0060'     # 0x60 GRAVE ACCENT
+    '\u0061'     # 0x61 LATIN SMALL LETTER A
+    '\u0062'     # 0x62 LATIN SMALL LETTER B
+    '\u0063'     # 0x63 LATIN SMALL LETTER C
+    '\u0064'     # 0x64 LATIN SMALL LETTER D
+    '\u0065'     # 0x65 LATIN SMALL LETTER E
+    '\u0066'     # 0x66 LATIN SMALL LETTER F
+    '\u0067'     # 0x67 LATIN SMALL LETTER G
+    '\u0068'     # 0x68 LATIN SMALL LETTER H
+    '\u0069'     # 0x69 LATIN SMALL LETTER I
+    '\u006a'     # 0x6A LATIN SMALL LETTER J
+    '\u006b'     # 0x6B LATIN SMALL LETTER K
+    '\u006c'     # 0x6C LATIN SMALL LETTER L
+    '\u006d'     # 0x6D LATIN SMALL LETTER M
+    '\u006e'     # 0x6E LATIN SMALL LETTER N
+    '\u006f'     # 0x6F LATIN SMALL LETTER O
+    '\u0070'     # 0x70 LATIN SMALL LETTER P
+    '\u0071'     # 0x71 LATIN SMALL LETTER Q
+    '\u0072'     # 0x72 LATIN SMALL LETTER R
+    '\u0073'     # 0x73 LATIN SMALL LETTER S
+    '\u0074'     # 0x74 LATIN SMALL LETTER T
+    '\u0075'     # 0x75 LATIN SMALL LETTER U
+    '\u0076'     # 0x76 LATIN SMALL LETTER V
+    '\u0077'     # 0x77 LATIN SMALL LETTER W
+    '\u0078'     # 0x78 LATIN SMALL LETTER X
+    '\u0079'     # 0x79 LATIN SMALL LETTER Y
+    '\u007a'     # 0x7A LATIN SMALL LETTER Z
+    '\u007b'     # 0x7B LEFT CURLY BRACKET
+    '\u007c'     # 0x7C VERTICAL LINE
+    '\u007d'     # 0x7D RIGHT CURLY BRACKET
+    '\u2192'     # 0x7E RIGHTWARDS ARROW
+    '\u2190'     # 0x7F LEFTWARDS ARROW
+    '\u00c7'     # 0x80 LATIN CAPITAL LETTER C WITH CEDILLA
+    '\u00fc'     # 0x81 LATIN SMALL LETTER U WITH DIAERESIS
+    '\u00e9'     # 0x82 LATIN SMALL LETTER E WITH ACUTE
+    '\u00e2'     # 0x83 LATIN SMALL LETTER A WITH CIRCUMFLEX
+    '\u00e4'     # 0x84 LATIN SMALL LETTER A WITH DIAERESIS
+    '\u00e0'     # 0x85 LATIN SMALL LETTER A WITH GRAVE
+    '\u00e5'     # 0x86 LATIN SMALL LETTER A WITH RING ABOVE
+    '\u00e7'     # 0x87 LATIN SMALL LETTER C WITH CEDILLA
+    '\u00ea'     # 0x88 LATIN SMALL LETTER E WITH CIRCUMFLEX
+    '\u00eb'     # 0x89 LATIN SMALL LETTER E WITH DIAERESIS
+    '\u00e8'     # 0x8A LATIN SMALL LETTER E WITH GRAVE
+    '\u00ef'     # 0x8B LATIN SMALL LETTER I WITH DIAERESIS
+    '\u00ee'     # 0x8C LATIN SMALL LETTER I WITH CIRCUMFLEX
+    '\u00ec'     # 0x8D LATIN SMALL LETTER I WITH GRAVE
+    '\u00c4'     # 0x8E LATIN CAPITAL LETTER A WITH DIAERESIS
+    '\u00c5'     # 0x8F LATIN CAPITAL LETTER A WITH RING ABOVE
+    '\u00c9'     # 0x90 LATIN CAPITAL LETTER E WITH ACUTE
+    '\u00e6'     # 0x91 LATIN SMALL LETTER AE
+    '\u00c6'     # 0x92 LATIN CAPITAL LETTER AE
+    '\u00f4'     # 0x93 LATIN SMALL LETTER O WITH CIRCUMFLEX
+    '\u00f6'     # 0x94 LATIN SMALL LETTER O WITH DIAERESIS
+    '\u00f2'     # 0x95 LATIN SMALL LETTER O WITH GRAVE
+    '\u00fb'     # 0x96 LATIN SMALL LETTER U WITH CIRCUMFLEX
+    '\u00f9'     # 0x97 LATIN SMALL LETTER U WITH GRAVE
+    '\u00ff'     # 0x98 LATIN SMALL LETTER Y WITH DIAERESIS
+    '\u014e'     # 0x99 LATIN CAPITAL LETTER O WITH BREVE
+    '\u00dc'     # 0x9A LATIN CAPITAL LETTER U WITH DIAERESIS
+    '\u00f1'     # 0x9B LATIN SMALL LETTER N WITH TILDE
+    '\u00d1'     # 0x9C LATIN CAPITAL LETTER N WITH TILDE
+    '\u00aa'     # 0x9D FEMININE ORDINAL INDICATOR
+    '\u00ba'     # 0x9E MASCULINE ORDINAL INDICATOR
+    '\u00bf'     # 0x9F INVERTED QUESTION MARK
+    '\u00a0'     # 0xA0 NO-BREAK SPACE
+    '\uff61'     # 0xA1 HALFWIDTH IDEOGRAPHIC FULL STOP
+    '\uff62'     # 0xA2 HALFWIDTH LEFT CORNER BRACKET
+    '\uff63'     # 0xA3 HALFWIDTH RIGHT CORNER BRACKET
+    '\uff64'     # 0xA4 HALFWIDTH IDEOGRAPHIC COMMA
+    '\uff65'     # 0xA5 HALFWIDTH KATAKANA MIDDLE DOT
+    '\uff66'     # 0xA6 HALFWIDTH KATAKANA LETTER WO
+    '\uff67'     # 0xA7 HALFWIDTH KATAKANA LETTER SMALL A
+    '\uff68'     # 0xA8 HALFWIDTH KATAKANA LETTER SMALL I
+    '\uff69'     # 0xA9 HALFWIDTH KATAKANA LETTER SMALL U
+    '\uff6a'     # 0xAA HALFWIDTH KATAKANA LETTER SMALL E
+    '\uff6b'     # 0xAB HALFWIDTH KATAKANA LETTER SMALL O
+    '\uff6c'     # 0xAC HALFWIDTH KATAKANA LETTER SMALL YA
+    '\uff6d'     # 0xAD HALFWIDTH KATAKANA LETTER SMALL YU
+    '\uff6e'     # 0xAE HALFWIDTH KATAKANA LETTER SMALL YO
+    '\uff6f'     # 0xAF HALFWIDTH KATAKANA LETTER SMALL TU
+    '\uff70'     # 0xB0 HALFWIDTH KATAKANA-HIRAGANA PROLONGED SOUND MARK
+    '\uff71'     # 0xB1 HALFWIDTH KATAKANA LETTER A
+    '\uff72'     # 0xB2 HALFWIDTH KATAKANA LETTER I
+    '\uff73'     # 0xB3 HALFWIDTH KATAKANA LETTER U
+    '\uff74'     # 0xB4 HALFWIDTH KATAKANA LETTER E
+    '\uff75'     # 0xB5 HALFWIDTH KATAKANA LETTER O
+    '\uff76'     # 0xB6 HALFWIDTH KATAKANA LETTER KA
+    '\uff77'     # 0xB7 HALFWIDTH KATAKANA LETTER KI
+    '\uff78'     # 0xB8 HALFWIDTH KATAKANA LETTER KU
+    '\uff79'     # 0xB9 HALFWIDTH KATAKANA LETTER KE
+    '\uff7a'     # 0xBA HALFWIDTH KATAKANA LETTER KO
+    '\uff7b'     # 0xBB HALFWIDTH KATAKANA LETTER SA
+    '\uff7c'     # 0xBC HALFWIDTH KATAKANA LETTER SI
+    '\uff7d'     # 0xBD HALFWIDTH KATAKANA LETTER SU
+    '\uff7e'     # 0xBE HALFWIDTH KATAKANA LETTER SE
+    '\uff7f'     # 0xBF HALFWIDTH KATAKANA LETTER SO
+    '\uff80'     # 0xC0 HALFWIDTH KATAKANA LETTER TA
+    '\uff81'     # 0xC1 HALFWIDTH KATAKANA LETTER TI
+    '\uff82'     # 0xC2 HALFWIDTH KATAKANA LETTER TU
+    '\uff83'     # 0xC3 HALFWIDTH KATAKANA LETTER TE
+    '\uff84'     # 0xC4 HALFWIDTH KATAKANA LETTER TO
+    '\uff85'     # 0xC5 HALFWIDTH KATAKANA LETTER NA
+    '\uff86'     # 0xC6 HALFWIDTH KATAKANA LETTER NI
+    '\uff87'     # 0xC7 HALFWIDTH KATAKANA LETTER NU
+    '\uff88'     # 0xC8 HALFWIDTH KATAKANA LETTER NE
+    '\uff89'     # 0xC9 HALFWIDTH KATAKANA LETTER NO
+    '\uff8a'     # 0xCA HALFWIDTH KATAKANA LETTER HA
+    '\uff8b'     # 0xCB HALFWIDTH KATAKANA LETTER HI
+    '\uff8c'     # 0xCC HALFWIDTH KATAKANA LETTER HU
+    '\uff8d'     # 0xCD HALFWIDTH KATAKANA LETTER HE
+    '\uff8e'     # 0xCE HALFWIDTH KATAKANA LETTER HO
+    '\uff8f'     # 0xCF HALFWIDTH KATAKANA LETTER MA
+    '\uff90'     # 0xD0 HALFWIDTH KATAKANA LETTER MI
+    '\uff91'     # 0xD1 HALFWIDTH KATAKANA LETTER MU
+    '\uff92'     # 0xD2 HALFWIDTH KATAKANA LETTER ME
+    '\uff93'     # 0xD3 HALFWIDTH KATAKANA LETTER MO
+    '\uff94'     # 0xD4 HALFWIDTH KATAKANA LETTER YA
+    '\uff95'     # 0xD5 HALFWIDTH KATAKANA LETTER YU
+    '\uff96'     # 0xD6 HALFWIDTH KATAKANA LETTER YO
+    '\uff97'     # 0xD7 HALFWIDTH KATAKANA LETTER RA
+    '\uff98'     # 0xD8 HALFWIDTH KATAKANA LETTER RI
+    '\uff99'     # 0xD9 HALFWIDTH KATAKANA LETTER RU
+    '\uff9a'     # 0xDA HALFWIDTH KATAKANA LETTER RE
+    '\uff9b'     # 0xDB HALFWIDTH KATAKANA LETTER RO
+    '\uff9c'     # 0xDC HALFWIDTH KATAKANA LETTER WA
+    '\uff9d'     # 0xDD HALFWIDTH KATAKANA LETTER N
+    '\uff9e'     # 0xDE HALFWIDTH KATAKANA VOICED SOUND MARK
+    '\uff9f'     # 0xDF HALFWIDTH KATAKANA SEMI-VOICED SOUND MARK
+    '\u00e1'     # 0xE0 LATIN SMALL LETTER A WITH ACUTE
+    '\u00ed'     # 0xE1 LATIN SMALL LETTER I WITH ACUTE
+    '\u00f3'     # 0xE2 LATIN SMALL LETTER O WITH ACUTE
+    '\u00fa'     # 0xE3 LATIN SMALL LETTER U WITH ACUTE
+    '\u00a2'     # 0xE4 CENT SIGN
+    '\u00a3'     # 0xE5 POUND SIGN
+    '\u00a5'     # 0xE6 YEN SIGN
+    '\u20a8'     # 0xE7 RUPEE SIGN
+    '\u0192'     # 0xE8 LATIN SMALL LETTER F WITH HOOK
+    '\u00a1'     # 0xE9 INVERTED EXCLAMATION MARK
+    '\u00c3'     # 0xEA LATIN CAPITAL LETTER A WITH TILDE
+    '\u00e3'     # 0xEB LATIN SMALL LETTER A WITH TILDE
+    '\u00d5'     # 0xEC LATIN CAPITAL LETTER O WITH TILDE
+    '\u00f5'     # 0xED LATIN SMALL LETTER O WITH TILDE
+    '\u00d8'     # 0xEE LATIN CAPITAL LETTER O WITH STROKE
+    '\u00f8'     # 0xEF LATIN SMALL LETTER O WITH STROKE
+    '\u02d9'     # 0xF0 DOT ABOVE
+    '\u00a8'     # 0xF1 DIAERESIS
+    '\u02da'     # 0xF2 RING ABOVE
+    '\u0060'     # 0xF3 GRAVE ACCENT
+    '\u00b4'     # 0xF4 ACUTE ACCENT
+    '\u00bd'     # 0xF5 VULGAR FRACTION ONE HALF
+    '\u00bc'     # 0xF6 VULGAR FRACTION ONE QUARTER
+    '\u00d7'     # 0xF7 MULTIPLICATION SIGN
+    '\u00f7'     # 0xF8 DIVISION SIGN
+    '\u2266'     # 0xF9 LESS-THAN OVER EQUAL TO
+    '\u2267'     # 0xFA GREATER-THAN OVER EQUAL TO
+    '\u226a'     # 0xFB MUCH LESS-THAN
+    '\u226b'     # 0xFC MUCH GREATER-THAN
+    '\u2260'     # 0xFD NOT EQUAL TO
+    '\u221a'     # 0xFE SQUARE ROOT
+    '\u203e'     # 0xFF OVERLINE
+)
+
+encoding_table = codecs.charmap_build(decoding_table)
+
+# Characters the ROM has more than once are left unmapped
+encoding_table.update({0x0060: None, 0x2190: None})
@@ -0,0 +1,504 @@
+"""
+A software ST7036 that understands the byte stream the driver sends.
+
+It models DDRAM, CGRAM, the instruction sets, entry mode, cursor and
+display shift, double height and the display on, cursor and blink bits,
+and renders what the panel would show as a pixel frame. With NumPy
+installed frames are NumPy arrays built with vectorised font lookups,
+otherwise they are lists of bytearrays. Either can be saved as a PNG.
+
+    emulator = Emulator(rows=3, columns=16)
+    lcd = st7036.st7036(25, transport=EmulatorTransport(emulator))
+    lcd.write("Hello")
+    emulator.text()       # ['Hello           ', ...]
+    emulator.save_png('frame.png')
+"""
+
+import struct
+import unicodedata
+import zlib
+
+import st7036_codec
+import st7036_transport
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CELL_WIDTH = 5
+CELL_HEIGHT = 8
+
+# Pixels between cells and between lines
+GAP = 1
+
+# ASCII 0x20..0x7E, five columns per character, bit 0 the top row
+_FONT_5X7 = (
+    '0000000000', '00005f0000', '0007000700', '147f147f14', '242a7f2a12', '2313086462',
+    '3649552250', '0005030000', '001c224100', '0041221c00', '14083e0814', '08083e0808',
+    '0050300000', '0808080808', '0060600000', '2010080402', '3e5149453e', '00427f4000',
+    '4261514946', '2141454b31', '1814127f10', '2745454539', '3c4a494930', '0171090503',
+    '3649494936', '064949291e', '0036360000', '0056360000', '0814224100', '1414141414',
+    '0041221408', '0201510906', '324979413e', '7e1111117e', '7f49494936', '3e41414122',
+    '7f4141221c', '7f49494941', '7f09090901', '3e4149497a', '7f0808087f', '00417f4100',
+    '2040413f01', '7f08142241', '7f40404040', '7f020c027f', '7f0408107f', '3e4141413e',
+    '7f09090906', '3e4151215e', '7f09192946', '4649494931', '01017f0101', '3f4040403f',
+    '1f2040201f', '3f4038403f', '6314081463', '0708700807', '6151494543', '007f414100',
+    '0204081020', '0041417f00', '0402010204', '4040404040', '0001020400', '2054545478',
+    '7f48444438', '3844444420', '384444487f', '3854545418', '087e090102', '0c5252523e',
+    '7f08040478', '00447d4000', '2040443d00', '7f10284400', '00417f4000', '7c04180478',
+    '7c08040478', '3844444438', '7c14141408', '081414187c', '7c08040408', '4854545420',
+    '043f444020', '3c4040207c', '1c2040201c', '3c4030403c', '4428102844', '0c5050503c',
+    '4464544c44', '0008364100', '00007f0000', '0041360800', '1008081008',
+)
+
+# Shown for ROM characters with no glyph here
+_PLACEHOLDER = (0x1F, 0x11, 0x11, 0x11, 0x11, 0x11, 0x1F, 0x00)
+
+
+def _ascii_glyph(character):
+    columns = bytearray.fromhex(_FONT_5X7[ord(character) - 0x20])
+    return tuple(sum(((columns[x] >> y) & 1) << (CELL_WIDTH - 1 - x) for x in range(CELL_WIDTH))
+                 for y in range(CELL_HEIGHT))
+
+
+def rom_font():
+    """
+    Builds a glyph for each ROM code from the codec's decoding_map:
+    ASCII characters from a 5x7 font, accented and compatibility
+    characters from their base letter, anything else as an empty box.
+
+    Returns:
+        list: 8 rows of 5-bit pixel data per code, as for create_char()
+    """
+    font = []
+    for code in range(256):
+        character = chr(st7036_codec.decoding_map[code])
+        if not 0x20 <= ord(character) <= 0x7E:
+            base = [part for part in unicodedata.normalize('NFKD', character)
+                    if not unicodedata.combining(part)]
+            character = base[0] if len(base) == 1 else character
+        if 0x20 <= ord(character) <= 0x7E:
+            font.append(_ascii_glyph(character))
+        else:
+            font.append(_PLACEHOLDER)
+    return font
+
+
+class Emulator(object):
+    """
+    Models an ST7036 wired up as a rows x columns display.
+
+    Attributes:
+        ddram (bytearray): display data RAM, 0x80 addresses
+        cgram (bytearray): character generator RAM, 8 glyphs of 8 rows
+        registers (dict): contrast, bias, booster, follower and icon
+            settings as last written
+    """
+    def __init__(self, rows=3, columns=16):
+        if rows not in (1, 2, 3):
+            raise ValueError("rows must be 1, 2 or 3")
+
+        self.rows = rows
+        self.columns = columns
+
+        # DDRAM address of each line
+        self.line_offsets = ([0x00], [0x00, 0x40], [0x00, 0x10, 0x20])[rows - 1]
+
+        self._font = rom_font()
+        self._font_rows = None
+        self._font_array = None
+        self.reset()
+
+    def reset(self):
+        """
+        Puts the controller in its power-on state.
+        """
+        self.ddram = bytearray([0x20] * 0x80)
+        self.cgram = bytearray(64)
+        self.icons = bytearray(16)
+
+        self.function_set = 0b00110000
+        self.address = 0
+        self.target = 'ddram'
+        self.increment = True
+        self.entry_shift = False
+        self.display_on = False
+        self.cursor_on = False
+        self.blink_on = False
+        self.shift = 0
+        self.double_height_top = True
+        self.registers = {}
+
+        self._font_rows = None
+        self._font_array = None
+
+    @property
+    def instruction_set(self):
+        return self.function_set & 0b11
+
+    @property
+    def double_height(self):
+        return bool(self.function_set & 0b100)
+
+    @property
+    def two_line_mode(self):
+        return self.rows < 3 and bool(self.function_set & 0b1000)
+
+    @property
+    def line_length(self):
+        """
+        DDRAM addresses per line, which display shift scrolls through.
+        """
+        if self.rows == 3:
+            return 0x10
+        return 0x28 if self.two_line_mode else 0x50
+
+    def feed(self, register_select, data):
+        """
+        Feeds bytes sent over SPI, as commands when register_select is
+        low and as data when it is high.
+        """
+        if register_select == st7036_transport.LOW:
+            for byte in data:
+                self.command(byte)
+        else:
+            for byte in data:
+                self.data(byte)
+
+    def command(self, byte):
+        instruction_set = self.function_set & 0b11
+
+        if byte & 0b10000000:
+            self.address = byte & 0b01111111
+            self.target = 'ddram'
+        elif byte & 0b11100000 == 0b00100000:
+            self.function_set = byte
+        elif instruction_set == 1 and byte & 0b11000000 == 0b01000000:
+            self._command_is1(byte)
+        elif byte & 0b11000000 == 0b01000000:
+            if instruction_set == 0:
+                self.address = byte & 0b00111111
+                self.target = 'cgram'
+        elif byte & 0b11110000 == 0b00010000:
+            if instruction_set == 0:
+                self._shift(byte)
+            elif instruction_set == 1:
+                self.registers['bias'] = (byte >> 3) & 1
+                self.registers['fx'] = byte & 1
+            elif instruction_set == 2:
+                self.double_height_top = bool(byte & 0b00001000)
+        elif byte & 0b11111000 == 0b00001000:
+            self.display_on = bool(byte & 0b100)
+            self.cursor_on = bool(byte & 0b010)
+            self.blink_on = bool(byte & 0b001)
+        elif byte & 0b11111100 == 0b00000100:
+            self.increment = bool(byte & 0b10)
+            self.entry_shift = bool(byte & 0b01)
+        elif byte & 0b11111110 == 0b00000010:
+            self.address = 0
+            self.target = 'ddram'
+            self.shift = 0
+        elif byte == 0b00000001:
+            self.ddram[:] = bytearray([0x20] * 0x80)
+            self.address = 0
+            self.target = 'ddram'
+            self.shift = 0
+            self.increment = True
+
+    def _command_is1(self, byte):
+        if byte & 0b11110000 == 0b01000000:
+            self.address = byte & 0b00001111
+            self.target = 'icons'
+        elif byte & 0b11110000 == 0b01010000:
+            self.registers['icons'] = (byte >> 3) & 1
+            self.registers['booster'] = (byte >> 2) & 1
+            self.registers['contrast'] = ((byte & 0b11) << 4) | (self.registers.get('contrast', 0) & 0x0F)
+        elif byte & 0b11110000 == 0b01100000:
+            self.registers['follower'] = (byte >> 3) & 1
+            self.registers['amplifier'] = byte & 0b111
+        else:
+            self.registers['contrast'] = (self.registers.get('contrast', 0) & 0x30) | (byte & 0x0F)
+
+    def _shift(self, byte):
+        right = bool(byte & 0b0100)
+        if byte & 0b1000:
+            self.shift += -1 if right else 1
+        elif self.target == 'ddram':
+            self.address = self._step(self.address, right)
+
+    def _step(self, address, forward=True):
+        if self.two_line_mode:
+            # two line mode skips from the end of one line to the next
+            if forward:
+                return {0x27: 0x40, 0x67: 0x00}.get(address, (address + 1) & 0x7F)
+            return {0x40: 0x27, 0x00: 0x67}.get(address, (address - 1) & 0x7F)
+        if self.rows < 3:
+            return (address + (1 if forward else -1)) % 0x50
+        return (address + (1 if forward else -1)) & 0x7F
+
+    def data(self, byte):
+        if self.target == 'cgram':
+            self.cgram[self.address] = byte & 0b00011111
+            self._update_glyph(self.address // 8)
+            self.address = (self.address + (1 if self.increment else -1)) & 0b00111111
+        elif self.target == 'icons':
+            self.icons[self.address] = byte & 0b00011111
+            self.address = (self.address + 1) & 0b00001111
+        else:
+            self.ddram[self.address] = byte
+            self.address = self._step(self.address, self.increment)
+            if self.entry_shift:
+                self.shift += 1 if self.increment else -1
+
+    def lines(self):
+        """
+        Returns:
+            list: (DDRAM address, height in lines) for each line shown,
+                taking double height into account
+        """
+        offsets = self.line_offsets
+        if not self.double_height or self.rows == 1:
+            return [(offset, 1) for offset in offsets]
+        if self.rows == 2:
+            return [(offsets[0], 2)]
+        if self.double_height_top:
+            return [(offsets[0], 2), (offsets[2], 1)]
+        return [(offsets[0], 1), (offsets[1], 2)]
+
+    def cells(self):
+        """
+        Returns:
+            list: (codes, height) for each line shown, codes being the
+                character code in each visible column after display shift
+        """
+        shown = []
+        length = self.line_length
+        for offset, height in self.lines():
+            shown.append((bytes(self.ddram[offset + (column + self.shift) % length]
+                                for column in range(self.columns)), height))
+        return shown
+
+    def text(self):
+        """
+        Returns:
+            list: the text on each line shown, user defined characters as
+                st7036_codec.USER_DEFINED_CHARACTER_0 onwards
+        """
+        return [codes.decode('st7036') for codes, height in self.cells()]
+
+    def cursor_cell(self):
+        """
+        Returns:
+            tuple: (line, column) the cursor is shown at, or None
+        """
+        if self.target != 'ddram':
+            return None
+        for line, (offset, height) in enumerate(self.lines()):
+            position = (self.address - offset - self.shift) % self.line_length
+            if 0 <= self.address - offset < self.line_length and position < self.columns:
+                return line, position
+        return None
+
+    def _update_glyph(self, slot):
+        if self._font_rows is not None:
+            self._font_rows[slot] = self._glyph_rows(self.cgram[slot * 8:slot * 8 + 8])
+        if self._font_array is not None:
+            self._font_array[slot] = _unpack_rows(self.cgram[slot * 8:slot * 8 + 8])
+
+    def _glyph(self, code):
+        if code < 8:
+            return tuple(self.cgram[code * 8:code * 8 + 8])
+        return self._font[code]
+
+    @staticmethod
+    def _glyph_rows(glyph):
+        return [bytes((row >> (CELL_WIDTH - 1 - x)) & 1 for x in range(CELL_WIDTH))
+                for row in glyph]
+
+    def render(self, blink_phase=False):
+        """
+        Draws the screen, 1 for a pixel that is on.
+
+        Args:
+            blink_phase (bool): draw a blinking cursor in its on phase
+        Returns:
+            numpy.ndarray or list: rows of pixels, a 2D uint8 array with
+                NumPy, otherwise a list of bytearrays
+        """
+        if numpy is not None:
+            return self._render_numpy(blink_phase)
+        return self._render_python(blink_phase)
+
+    def size(self):
+        """
+        Returns:
+            tuple: (width, height) of a frame in pixels
+        """
+        return (self.columns * (CELL_WIDTH + GAP) - GAP,
+                self.rows * (CELL_HEIGHT + GAP) - GAP)
+
+    def _cursor(self, blink_phase):
+        if not self.display_on or not (self.cursor_on or (self.blink_on and blink_phase)):
+            return None, None
+        return self.cursor_cell(), self.blink_on and blink_phase
+
+    @staticmethod
+    def _scanlines(height):
+        # glyph row for each pixel row of a line, double height lines
+        # stretch 8 rows over both lines and the gap between them
+        if height == 1:
+            return list(range(CELL_HEIGHT))
+        span = 2 * CELL_HEIGHT + GAP
+        return [y * CELL_HEIGHT // span for y in range(span)]
+
+    def _render_python(self, blink_phase):
+        width, height = self.size()
+        if not self.display_on:
+            return [bytearray(width) for y in range(height)]
+
+        if self._font_rows is None:
+            self._font_rows = [self._glyph_rows(self._glyph(code)) for code in range(256)]
+        font_rows = self._font_rows
+        gap = bytes(GAP)
+        cursor, block = self._cursor(blink_phase)
+
+        frame = []
+        for line, (codes, line_height) in enumerate(self.cells()):
+            glyphs = [font_rows[code] for code in codes]
+            if cursor is not None and cursor[0] == line:
+                glyphs[cursor[1]] = self._glyph_rows(_cursor_glyph(self._glyph(codes[cursor[1]]), block))
+
+            scanlines = self._scanlines(line_height)
+            for y in scanlines:
+                frame.append(bytearray(gap.join(glyph[y] for glyph in glyphs)))
+            if len(frame) < height:
+                frame.append(bytearray(width))
+
+        return frame[:height]
+
+    def _render_numpy(self, blink_phase):
+        width, height = self.size()
+        frame = numpy.zeros((height, width), dtype=numpy.uint8)
+        if not self.display_on:
+            return frame
+
+        if self._font_array is None:
+            self._font_array = numpy.array([_unpack_rows(self._glyph(code)) for code in range(256)],
+                                           dtype=numpy.uint8)
+        font = self._font_array
+        cursor, block = self._cursor(blink_phase)
+
+        top = 0
+        for line, (codes, line_height) in enumerate(self.cells()):
+            # (columns, 8, 5) glyphs, padded with the gap column and laid
+            # out side by side as (8, columns * 6)
+            glyphs = font[numpy.frombuffer(codes, dtype=numpy.uint8)]
+            if cursor is not None and cursor[0] == line:
+                glyphs = glyphs.copy()
+                glyphs[cursor[1]] = _unpack_rows(_cursor_glyph(self._glyph(codes[cursor[1]]), block))
+
+            padded = numpy.zeros((self.columns, CELL_HEIGHT, CELL_WIDTH + GAP), dtype=numpy.uint8)
+            padded[:, :, :CELL_WIDTH] = glyphs
+            pixels = padded.transpose(1, 0, 2).reshape(CELL_HEIGHT, -1)[:, :width]
+
+            scanlines = self._scanlines(line_height)
+            frame[top:top + len(scanlines)] = pixels[scanlines]
+            top += len(scanlines) + GAP
+
+        return frame
+
+    def save_png(self, path, blink_phase=False, scale=4):
+        """
+        Renders the screen and saves it as a PNG.
+        """
+        write_png(path, self.render(blink_phase), scale)
+
+
+def _unpack_rows(glyph):
+    rows = numpy.array(glyph, dtype=numpy.uint8).reshape(CELL_HEIGHT, 1)
+    return (rows >> numpy.arange(CELL_WIDTH - 1, -1, -1, dtype=numpy.uint8)) & 1
+
+
+def _cursor_glyph(glyph, block):
+    if block:
+        return (0x1F,) * CELL_HEIGHT
+    return tuple(glyph[:CELL_HEIGHT - 1]) + (0x1F,)
+
+
+def write_png(path, frame, scale=4, on=0x10, off=0xB0):
+    """
+    Saves a frame from Emulator.render() as an 8-bit greyscale PNG, with
+    no dependencies beyond zlib.
+
+    Args:
+        path (string): file to write
+        frame: rows of 0 and 1 pixels
+        scale (int): size of each pixel in the image
+        on (int): grey level of pixels that are on
+        off (int): grey level of pixels that are off
+    """
+    levels = bytearray(256)
+    levels[0] = off
+    levels[1] = on
+    table = bytes(levels)
+
+    rows = []
+    for row in frame:
+        line = bytes(row).translate(table)
+        line = b''.join(bytes([pixel]) * scale for pixel in line)
+        rows.extend([b'\x00' + line] * scale)
+
+    height = len(rows)
+    width = (len(rows[0]) - 1) if rows else 0
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(b''.join(rows))))
+        f.write(chunk(b'IEND', b''))
+
+
+class EmulatorTransport(st7036_transport.Transport):
+    """
+    Feeds an Emulator with what the driver sends.
+    """
+    def __init__(self, emulator=None):
+        st7036_transport.Transport.__init__(self, _EmulatorBus(self), _EmulatorGPIO(self))
+        self.emulator = emulator if emulator is not None else Emulator()
+        self.register_select = None
+
+
+class _EmulatorBus(object):
+    def __init__(self, transport):
+        self._transport = transport
+        self.max_speed_hz = 0
+
+    def xfer(self, data, speed_hz=0, delay_usecs=0):
+        self._transport.emulator.feed(self._transport.register_select, data)
+        return [0] * len(data)
+
+    def close(self):
+        pass
+
+
+class _EmulatorGPIO(object):
+    def __init__(self, transport):
+        self._transport = transport
+
+    def setup(self, pin):
+        pass
+
+    def output(self, pin, level):
+        transport = self._transport
+        if pin == transport.register_select_pin:
+            transport.register_select = level
+        elif pin == transport.reset_pin and level == st7036_transport.LOW:
+            transport.emulator.reset()
+
+    def close(self):
+        pass
@@ -0,0 +1,191 @@
+from collections import OrderedDict
+
+import st7036_codec
+
+CGRAM_SLOTS = 8
+
+
+class GlyphCache(object):
+    """
+    Shares the 8 CGRAM slots between any number of custom glyphs.
+
+    Glyphs are registered once and embedded in text as private use
+    characters. prepare() then gives every glyph the text uses a slot,
+    uploading only glyphs that are not already resident and evicting the
+    least recently used glyph, preferring ones not currently on screen.
+    Glyphs that must stay put while shown can be reserve()d, so they are
+    never evicted.
+    """
+    def __init__(self, lcd, slots=range(CGRAM_SLOTS)):
+        """
+        Args:
+            lcd (st7036): display to upload glyphs to
+            slots (list): CGRAM slots the cache may use, defaults to all 8
+        """
+        self.lcd = lcd
+        self.slots = list(slots)
+
+        self._bitmaps = []
+        self._index = {}
+        self._names = {}
+
+        # glyph index -> slot, least recently used first
+        self._resident = OrderedDict()
+        self._slot_glyph = {}
+
+        # glyph indexes that are never evicted, see reserve()
+        self._reserved = set()
+
+    def register(self, char_map, name=None):
+        """
+        Registers a glyph bitmap. Registering the same bitmap twice
+        returns the same character.
+
+        Args:
+            char_map (list): 8 rows of 5-bit pixel data
+            name (string): optional name to look the glyph up by
+        Returns:
+            string: the character to use for the glyph in text
+        Raises:
+            ValueError: if char_map does not have 8 rows
+        """
+        bitmap = tuple(char_map)
+        if len(bitmap) != 8:
+            raise ValueError("char_map must have 8 rows")
+
+        index = self._index.get(bitmap)
+        if index is None:
+            index = len(self._bitmaps)
+            character = chr(st7036_codec.glyph_code_point(index))
+            self._bitmaps.append(bitmap)
+            self._index[bitmap] = index
+        else:
+            character = chr(st7036_codec.glyph_code_point(index))
+
+        if name is not None:
+            self._names[name] = character
+
+        return character
+
+    def reserve(self, characters):
+        """
+        Keeps glyphs in CGRAM once uploaded, never evicting them to make
+        room for others. Reserved glyphs can use every slot between them,
+        glyphs that are not reserved then take turns in what is left.
+
+        Args:
+            characters (string): registered glyph characters
+        Raises:
+            ValueError: if more glyphs would be reserved than there are
+                slots
+        """
+        indexes = set(self._glyph_index(character) for character in characters)
+        if len(self._reserved | indexes) > len(self.slots):
+            raise ValueError("%d glyphs are reserved already, %d more do not fit in %d CGRAM slots" %
+                             (len(self._reserved), len(indexes - self._reserved), len(self.slots)))
+        self._reserved |= indexes
+
+    def release(self, characters):
+        """
+        Lets reserved glyphs be evicted again.
+        """
+        for character in characters:
+            self._reserved.discard(self._glyph_index(character))
+
+    def __getitem__(self, name):
+        return self._names[name]
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def prepare(self, text):
+        """
+        Makes sure every glyph in text is resident in CGRAM.
+
+        Args:
+            text (string): text containing registered glyph characters
+        Returns:
+            string: text with each glyph swapped for its user defined character
+        Raises:
+            ValueError: if text uses more glyphs than there are slots
+        """
+        wanted = []
+        for character in text:
+            if st7036_codec.is_glyph_code_point(ord(character)):
+                index = self._glyph_index(character)
+                if index not in wanted:
+                    wanted.append(index)
+
+        if not wanted:
+            return text
+
+        if len(wanted) > len(self.slots):
+            raise ValueError("text uses more glyphs than there are CGRAM slots")
+
+        table = {}
+        uploads = {}
+        for index in wanted:
+            slot = self._resident.get(index)
+            if slot is None:
+                slot = self._allocate(wanted)
+                self._resident[index] = slot
+                self._slot_glyph[slot] = index
+            else:
+                self._resident.move_to_end(index)
+
+            uploads[slot] = self._bitmaps[index]
+            table[st7036_codec.GLYPH_CODE_POINT_BASE + index] = st7036_codec.USER_DEFINED_CHARACTER_0 + slot
+
+        # resident glyphs are passed too, create_chars() skips slots that
+        # still hold them and puts back any lost to a reset or overwritten
+        self.lcd.create_chars(uploads)
+
+        return text.translate(table)
+
+    def write(self, text):
+        """
+        Write text containing glyphs to the current cursor position.
+        """
+        self.lcd.write(self.prepare(text))
+
+    def draw(self, column, row, text):
+        """
+        Draw text containing glyphs into the display's framebuffer.
+        """
+        self.lcd.draw(column, row, self.prepare(text))
+
+    def _allocate(self, wanted):
+        for slot in self.slots:
+            if slot not in self._slot_glyph:
+                return slot
+
+        visible = self._visible_slots()
+        candidates = [index for index in self._resident
+                      if index not in wanted and index not in self._reserved]
+        if not candidates:
+            raise ValueError("every free CGRAM slot is taken by a reserved glyph")
+
+        evict = None
+        for index in candidates:
+            if self._resident[index] not in visible:
+                evict = index
+                break
+        if evict is None:
+            evict = candidates[0]
+
+        slot = self._resident.pop(evict)
+        del self._slot_glyph[slot]
+        return slot
+
+    def _glyph_index(self, character):
+        code_point = ord(character)
+        index = code_point - st7036_codec.GLYPH_CODE_POINT_BASE
+        if not st7036_codec.is_glyph_code_point(code_point) or index >= len(self._bitmaps):
+            raise ValueError("unregistered glyph U+%X" % code_point)
+        return index
+
+    def _visible_slots(self):
+        shown = bytearray(self.lcd.visible_bytes())
+        if self.lcd.framebuffer is not None:
+            shown += self.lcd.framebuffer
+        return set(code for code in shown if code < CGRAM_SLOTS)
@@ -0,0 +1,165 @@
+"""
+Drives several displays as one, Python 3.2 or later.
+
+Each SPI bus gets a worker thread of its own. Displays on different
+buses are updated in parallel, displays sharing a bus take turns on its
+thread. Displays are placed on a character canvas so text can be laid
+out across panels with a single call.
+"""
+
+import collections
+import operator
+from concurrent.futures import ThreadPoolExecutor
+
+import st7036
+
+Panel = collections.namedtuple('Panel', 'name lcd bus column row')
+
+
+class DisplayManager(object):
+    """
+    Owns a set of displays placed on a shared canvas.
+
+        manager = DisplayManager()
+        manager.add('left', register_select_pin=25, spi_bus=0, spi_chip_select=0)
+        manager.add('right', register_select_pin=24, spi_bus=1, spi_chip_select=0, column=16)
+        manager.draw(0, 0, "a line of text wider than one panel")
+        manager.flush()
+    """
+    def __init__(self):
+        self.panels = collections.OrderedDict()
+        self._executors = {}
+
+    def add(self, name, lcd=None, column=0, row=0, bus=None, **options):
+        """
+        Adds a display to the canvas.
+
+        Args:
+            name (string): name to refer to the display by
+            lcd (st7036): display to add, created with framebuffer=True,
+                or None to create one from options
+            column (int): canvas column of the display's left edge
+            row (int): canvas row of the display's top edge
+            bus: displays with the same bus share a worker thread,
+                defaults to the spi_bus option, or 0
+            options: st7036() arguments when lcd is None
+        Returns:
+            st7036: the display
+        Raises:
+            ValueError: if the name is taken or the display has no framebuffer
+        """
+        if name in self.panels:
+            raise ValueError("there is already a display called %r" % (name,))
+
+        if bus is None:
+            bus = options.get('spi_bus', 0)
+
+        if lcd is None:
+            options['framebuffer'] = True
+            lcd = self._executor(bus).submit(lambda: st7036.st7036(**options)).result()
+        elif lcd.framebuffer is None:
+            raise ValueError("displays need to be created with framebuffer=True")
+
+        self.panels[name] = Panel(name, lcd, bus, column, row)
+        return lcd
+
+    def __getitem__(self, name):
+        return self.panels[name].lcd
+
+    def size(self):
+        """
+        Returns:
+            tuple: (columns, rows) of the canvas covering every display
+        """
+        columns = max([panel.column + panel.lcd.columns for panel in self.panels.values()] or [0])
+        rows = max([panel.row + panel.lcd.rows for panel in self.panels.values()] or [0])
+        return columns, rows
+
+    def draw(self, column, row, value):
+        """
+        Draws text on the canvas, into the framebuffer of each display it
+        crosses. Parts that fall between displays are dropped.
+        """
+        for panel in self.panels.values():
+            lcd = panel.lcd
+            if not panel.row <= row < panel.row + lcd.rows:
+                continue
+
+            start = max(column, panel.column)
+            end = min(column + len(value), panel.column + lcd.columns)
+            if start >= end:
+                continue
+
+            with lcd.lock:
+                lcd.draw(start - panel.column, row - panel.row, value[start - column:end - column])
+
+    def clear(self):
+        """
+        Blanks every framebuffer, the displays clear on the next flush().
+        """
+        for panel in self.panels.values():
+            with panel.lcd.lock:
+                panel.lcd.clear_framebuffer()
+
+    def flush(self):
+        """
+        Sends the changes on every display, buses in parallel, and waits
+        for them all.
+
+        Returns:
+            dict: cells sent, by display name
+        """
+        return self.call(operator.methodcaller('flush'))
+
+    def call(self, function, *args, **kwargs):
+        """
+        Runs function(lcd, *args, **kwargs) for every display, in
+        parallel across buses, and waits for them all.
+
+        Returns:
+            dict: results, by display name
+        """
+        futures = collections.OrderedDict()
+        for bus, panels in self._by_bus().items():
+            futures[bus] = self._executor(bus).submit(_each, panels, function, args, kwargs)
+
+        results = collections.OrderedDict()
+        for future in futures.values():
+            results.update(future.result())
+        return results
+
+    def submit(self, name, function, *args, **kwargs):
+        """
+        Queues function(lcd, *args, **kwargs) on the thread of one
+        display's bus.
+
+        Returns:
+            Future: for the result
+        """
+        panel = self.panels[name]
+        return self._executor(panel.bus).submit(function, panel.lcd, *args, **kwargs)
+
+    def close(self):
+        """
+        Finishes queued work and stops the bus threads.
+        """
+        for executor in self._executors.values():
+            executor.shutdown()
+        self._executors = {}
+
+    def _executor(self, bus):
+        executor = self._executors.get(bus)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+            self._executors[bus] = executor
+        return executor
+
+    def _by_bus(self):
+        buses = collections.OrderedDict()
+        for panel in self.panels.values():
+            buses.setdefault(panel.bus, []).append(panel)
+        return buses
+
+
+def _each(panels, function, args, kwargs):
+    return [(panel.name, function(panel.lcd, *args, **kwargs)) for panel in panels]
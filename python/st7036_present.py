@@ -0,0 +1,165 @@
+import math
+import threading
+import time
+
+
+class PresentScheduler(object):
+    """
+    Limits how often a display is updated.
+
+    Text is drawn into the display's framebuffer as often as the caller
+    likes, and only sent at fixed ticks, rate times a second, aligned to
+    whole multiples of the period from align. A clock at rate=1 and
+    align=0 changes exactly on the second. Ticks with nothing new to
+    show send nothing.
+
+    Every tick flushes whatever differs, however it got into the
+    framebuffer: through draw(), widgets, a DisplayManager or the
+    display's own draw().
+
+    Attributes:
+        presented (int): ticks that sent something to the display
+        skipped (int): ticks where the framebuffer had not changed
+        coalesced (int): draw() calls merged into a later present
+        dropped (int): ticks with pending draw() calls that passed
+            without a present, because present() was called or the
+            thread woke late
+    """
+    def __init__(self, lcd, rate=10, align=0.0, clock=time.time):
+        """
+        Args:
+            lcd (st7036): display, created with framebuffer=True
+            rate (float): presents per second at most
+            align (float): time a tick falls on, ticks are align + n / rate
+            clock (callable): returns the current time in seconds
+        Raises:
+            ValueError: if the display has no framebuffer or rate is not positive
+        """
+        if lcd.framebuffer is None:
+            raise ValueError("PresentScheduler needs a display created with framebuffer=True")
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.lcd = lcd
+        self.period = 1.0 / rate
+        self.align = align
+        self.clock = clock
+
+        self._deadline = None
+        self._draws = 0
+        self._first_draw = None
+
+        self.presented = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+        self._thread = None
+        self._stop = False
+        self._wake = threading.Event()
+
+    def draw(self, column, row, value):
+        """
+        Draws into the framebuffer, to be sent on the next tick.
+        """
+        with self.lcd.lock:
+            self.lcd.draw(column, row, value)
+            if not self._draws:
+                self._first_draw = self.clock()
+            self._draws += 1
+
+    def next_tick(self, now=None):
+        """
+        Returns:
+            float: the first tick after now
+        """
+        if now is None:
+            now = self.clock()
+        return self.align + (math.floor((now - self.align) / self.period) + 1) * self.period
+
+    def present(self, now=None):
+        """
+        Sends the framebuffer if a tick has passed since the last present,
+        otherwise returns straight away. Cheap enough to call in a loop
+        after every update.
+
+        Returns:
+            int: number of cells sent
+        """
+        if now is None:
+            now = self.clock()
+
+        with self.lcd.lock:
+            if self._deadline is None:
+                self._deadline = self.next_tick(now) - self.period
+            if now < self._deadline:
+                return 0
+
+            deadline = self._deadline
+            self._deadline = self.next_tick(now)
+
+            if self._draws:
+                # ticks since the first pending draw that went by unpresented
+                self.dropped += int(math.floor((now - max(deadline, self._first_draw)) / self.period))
+                self.coalesced += self._draws - 1
+                self._draws = 0
+
+            sent = self.lcd.flush()
+            if sent:
+                self.presented += 1
+            else:
+                self.skipped += 1
+            return sent
+
+    def wait(self):
+        """
+        Sleeps until the next tick and presents.
+
+        Returns:
+            int: number of cells sent
+        """
+        now = self.clock()
+        deadline = self._deadline if self._deadline is not None and self._deadline > now else self.next_tick(now)
+        self._wake.wait(max(0, deadline - now))
+        return self.present()
+
+    def start(self):
+        """
+        Presents on every tick from a background thread.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop = False
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread.
+        """
+        if self._thread is None:
+            return
+
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+    def stats(self):
+        """
+        Returns:
+            dict: the present counters
+        """
+        return {
+            'presented': self.presented,
+            'skipped': self.skipped,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+        }
+
+    def _run(self):
+        while not self._stop:
+            self.wait()
@@ -0,0 +1,238 @@
+"""
+Opt-in instrumentation for the st7036 driver.
+
+Enabling stats wraps the methods of one display instance, and its bus,
+pins and timing, with counting versions. Nothing is wrapped until
+st7036.enable_stats() is called and disable_stats() takes the wrappers
+off again, so a display without stats runs exactly the code it would
+without this module.
+"""
+
+import threading
+import time
+
+# Methods counted per call
+COUNTED = ('write', 'flush', 'create_char', 'create_chars', 'clear', 'set_cursor_offset',
+           '_write_command', '_write_instruction_set', '_write_data')
+
+# Methods whose latency goes into a histogram
+TIMED = ('write', 'flush', 'create_char', 'create_chars')
+
+
+class Histogram(object):
+    """
+    Latencies in power of two buckets of microseconds, bucket n counting
+    latencies below 2**n us.
+    """
+    def __init__(self):
+        self.buckets = []
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds):
+        bucket = int(seconds * 1000000).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """
+        Returns:
+            float: upper bound in seconds of the bucket holding the given
+                fraction of latencies, None if there are none
+        """
+        if not self.count:
+            return None
+
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= wanted:
+                return (1 << bucket) / 1000000.0
+        return self.max
+
+    def snapshot(self):
+        return {
+            'buckets': list(self.buckets),
+            'count': self.count,
+            'total_s': self.total,
+            'min_s': self.min,
+            'max_s': self.max,
+        }
+
+
+class Stats(object):
+    """
+    Counters for one display.
+
+    Attributes:
+        calls (dict): calls per method
+        latency (dict): Histogram per timed method
+        spi_bytes (int): bytes sent over SPI
+        spi_transactions (int): xfer() calls
+        spi_delay (float): seconds of delay_usecs requested from spidev
+        gpio_toggles (int): GPIO writes
+        sleep (float): seconds of delay waited out by the timing profile
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hooks = []
+        self._lcd = None
+        self._saved = None
+        self.reset()
+
+    def reset(self):
+        """
+        Zeroes every counter.
+        """
+        with self._lock:
+            self.calls = dict((name, 0) for name in COUNTED)
+            self.latency = dict((name, Histogram()) for name in TIMED)
+            self.spi_bytes = 0
+            self.spi_transactions = 0
+            self.spi_delay = 0.0
+            self.gpio_toggles = 0
+            self.sleep = 0.0
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: a copy of every counter, safe to serialise as JSON
+        """
+        with self._lock:
+            return {
+                'calls': dict(self.calls),
+                'latency': dict((name, histogram.snapshot()) for name, histogram in self.latency.items()),
+                'spi_bytes': self.spi_bytes,
+                'spi_transactions': self.spi_transactions,
+                'spi_delay_s': self.spi_delay,
+                'gpio_toggles': self.gpio_toggles,
+                'sleep_s': self.sleep,
+            }
+
+    def add_hook(self, hook):
+        """
+        Calls hook(name, seconds) after every timed method, from the
+        thread that made the call, for exporting to a metrics system.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    def attach(self, lcd):
+        """
+        Starts counting for a display. Use st7036.enable_stats().
+        """
+        if self._lcd is not None:
+            raise RuntimeError("stats are already attached to a display")
+
+        self._lcd = lcd
+        self._saved = (lcd.spi, lcd.gpio, lcd.timing)
+
+        for name in COUNTED:
+            setattr(lcd, name, self._wrap(name, getattr(lcd, name)))
+
+        lcd.spi = _CountingBus(self, lcd.spi)
+        lcd.gpio = _CountingGPIO(self, lcd.gpio)
+        lcd.timing = _CountingTiming(self, lcd.timing)
+
+    def detach(self):
+        """
+        Stops counting, putting back the display's own methods.
+        """
+        lcd = self._lcd
+        if lcd is None:
+            return
+
+        for name in COUNTED:
+            del lcd.__dict__[name]
+        lcd.spi, lcd.gpio, lcd.timing = self._saved
+
+        self._lcd = None
+        self._saved = None
+
+    def _wrap(self, name, method):
+        lock = self._lock
+
+        if name not in TIMED:
+            def counted(*args, **kwargs):
+                with lock:
+                    self.calls[name] += 1
+                return method(*args, **kwargs)
+            return counted
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    self.calls[name] += 1
+                    self.latency[name].add(elapsed)
+                for hook in self._hooks:
+                    hook(name, elapsed)
+        return timed
+
+
+class _CountingBus(object):
+    def __init__(self, stats, spi):
+        self._stats = stats
+        self._spi = spi
+
+    def __getattr__(self, name):
+        return getattr(self._spi, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._spi, name, value)
+
+    def xfer(self, data, *args):
+        stats = self._stats
+        delay_usecs = args[1] if len(args) > 1 else 0
+        with stats._lock:
+            stats.spi_bytes += len(data)
+            stats.spi_transactions += 1
+            stats.spi_delay += delay_usecs * len(data) / 1000000.0
+        return self._spi.xfer(data, *args)
+
+
+class _CountingGPIO(object):
+    def __init__(self, stats, gpio):
+        self._stats = stats
+        self._gpio = gpio
+
+    def __getattr__(self, name):
+        return getattr(self._gpio, name)
+
+    def output(self, pin, level):
+        with self._stats._lock:
+            self._stats.gpio_toggles += 1
+        self._gpio.output(pin, level)
+
+
+class _CountingTiming(object):
+    def __init__(self, stats, timing):
+        self._stats = stats
+        self._timing = timing
+
+    def __getattr__(self, name):
+        return getattr(self._timing, name)
+
+    def wait(self, seconds):
+        with self._stats._lock:
+            self._stats.sleep += seconds
+        self._timing.wait(seconds)
@@ -0,0 +1,160 @@
+import math
+import time
+
+# Delay strategies
+SLEEP = 'sleep'    # time.sleep(), frees the CPU but overshoots
+BUSY = 'busy'      # spin on a high resolution clock
+SPIDEV = 'spidev'  # spidev's delay_usecs, applied by the kernel after each byte
+
+
+class TimingProfile(object):
+    """
+    Minimum delays, in seconds, the controller needs after each kind of
+    operation, and how the driver should wait them out.
+    """
+    def __init__(self,
+                 data=0.0000263,
+                 command=0.0000263,
+                 clear=0.00108,
+                 cgram=0.0000263,
+                 reset_pulse=0.001,
+                 reset_recovery=0.001,
+                 strategy=SLEEP,
+                 max_speed_hz=1000000):
+        """
+        Args:
+            data (float): after writing a byte to DDRAM
+            command (float): after an instruction
+            clear (float): after clear display or return home
+            cgram (float): after writing a byte to CGRAM
+            reset_pulse (float): reset pin low time
+            reset_recovery (float): wait after releasing reset
+            strategy (string): SLEEP, BUSY or SPIDEV
+            max_speed_hz (int): SPI clock
+        Raises:
+            ValueError: if strategy is not recognised
+        """
+        if strategy not in (SLEEP, BUSY, SPIDEV):
+            raise ValueError("strategy must be one of %r, %r or %r" % (SLEEP, BUSY, SPIDEV))
+
+        self.data = data
+        self.command = command
+        self.clear = clear
+        self.cgram = cgram
+        self.reset_pulse = reset_pulse
+        self.reset_recovery = reset_recovery
+        self.strategy = strategy
+        self.max_speed_hz = max_speed_hz
+
+        # filled in by calibrate()
+        self.calibration = None
+
+    def copy(self, **changes):
+        """
+        Returns a copy of the profile with some values changed.
+        """
+        values = dict(data=self.data,
+                      command=self.command,
+                      clear=self.clear,
+                      cgram=self.cgram,
+                      reset_pulse=self.reset_pulse,
+                      reset_recovery=self.reset_recovery,
+                      strategy=self.strategy,
+                      max_speed_hz=self.max_speed_hz)
+        values.update(changes)
+        return TimingProfile(**values)
+
+    def usecs(self, seconds):
+        """
+        Converts a delay to whole microseconds for spidev, rounding up.
+        """
+        return int(math.ceil(round(seconds * 1000000, 6)))
+
+    def wait(self, seconds):
+        """
+        Waits for at least the given number of seconds.
+
+        With the SPIDEV strategy transfers carry their own delay, this is
+        only used where no transfer is involved, such as the reset pulse.
+        """
+        if self.strategy == BUSY:
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            time.sleep(seconds)
+
+    def __repr__(self):
+        return ("TimingProfile(data=%r, command=%r, clear=%r, cgram=%r, "
+                "reset_pulse=%r, reset_recovery=%r, strategy=%r, max_speed_hz=%r)" % (
+                    self.data, self.command, self.clear, self.cgram,
+                    self.reset_pulse, self.reset_recovery, self.strategy, self.max_speed_hz))
+
+
+# Execution times from the ST7036 datasheet at its 380kHz oscillator
+DATASHEET = TimingProfile()
+
+# The delays this driver used before timing profiles existed
+LEGACY = TimingProfile(data=0.00005,
+                       command=0.00006,
+                       clear=0.00006,
+                       cgram=0.0001)
+
+
+def measure(seconds, strategy, samples=200):
+    """
+    Measures how long a delay really takes with a strategy.
+
+    Returns:
+        float: mean elapsed time in seconds
+    """
+    profile = TimingProfile(strategy=strategy)
+    start = time.perf_counter()
+    for i in range(samples):
+        profile.wait(seconds)
+    return (time.perf_counter() - start) / samples
+
+
+def calibrate(profile=DATASHEET, spidev=False, samples=200, tolerance=0.5):
+    """
+    Picks the cheapest delay strategy for this machine.
+
+    Every strategy waits at least the requested time, so the choice is
+    about overshoot. time.sleep() is kept while it overshoots the command
+    delay by no more than tolerance times what spinning costs, as it
+    leaves the CPU free, otherwise the profile busy-waits. spidev's
+    delay_usecs is applied in-kernel within the same ioctl as the
+    transfer and is used whenever the bus supports it.
+
+    Args:
+        profile (TimingProfile): delays to calibrate for
+        spidev (bool): the bus is a spidev device that honours delay_usecs
+        samples (int): delays to time per strategy
+        tolerance (float): acceptable extra overshoot for sleeping
+    Returns:
+        TimingProfile: a copy of profile with strategy set, the measured
+            mean delays are kept in its calibration attribute
+    """
+    calibration = {
+        SLEEP: measure(profile.command, SLEEP, samples),
+        BUSY: measure(profile.command, BUSY, samples),
+    }
+
+    if spidev:
+        strategy = SPIDEV
+    elif calibration[SLEEP] <= calibration[BUSY] * (1 + tolerance):
+        strategy = SLEEP
+    else:
+        strategy = BUSY
+
+    calibrated = profile.copy(strategy=strategy)
+    calibrated.calibration = calibration
+    return calibrated
+
+
+if __name__ == "__main__":
+    profile = calibrate()
+    print("requested %.1fus" % (profile.command * 1000000))
+    for strategy, elapsed in sorted(profile.calibration.items()):
+        print("%6s %.1fus" % (strategy, elapsed * 1000000))
+    print(profile)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+"""
+Records exactly what a display is sent, to replay or analyse later.
+
+A trace is a flat file of fixed-width records, one per byte sent over
+SPI, so recording only ever appends. Run this module on a trace file to
+print an analysis of the bytes that were wasted:
+
+    python st7036_trace.py trace.bin [rows]
+"""
+
+import collections
+import struct
+import sys
+import time
+
+import st7036
+import st7036_timing
+import st7036_transport
+
+# timestamp, register select level, instruction set in effect, set on
+# the first byte of each transfer, byte, delay_usecs of the transfer
+RECORD = struct.Struct('<dBBBBH')
+
+# Instruction set before any function set has been seen
+UNKNOWN = 0xFF
+
+Record = collections.namedtuple('Record', 'timestamp register_select instruction_set start byte delay_usecs')
+
+COMMAND_CLEAR = 0b00000001
+COMMAND_HOME = 0b00000010
+
+
+def _is_function_set(byte):
+    return byte & 0b11100000 == 0b00100000
+
+
+class TraceTransport(st7036_transport.Transport):
+    """
+    Wraps another transport, recording every byte sent through it.
+
+    Pass it to st7036() in place of the real transport:
+
+        st7036(25, transport=TraceTransport(default_transport(), 'trace.bin'))
+    """
+    def __init__(self, transport, path):
+        """
+        Args:
+            transport (Transport): transport to send through
+            path (string): trace file, appended to if it exists
+        """
+        st7036_transport.Transport.__init__(self, _TracingBus(self, transport.spi),
+                                            _TracingGPIO(self, transport.gpio))
+        self.transport = transport
+        self.file = open(path, 'ab')
+
+        self.register_select = None
+        self.instruction_set = UNKNOWN
+
+    def setup(self, register_select_pin, reset_pin=None):
+        st7036_transport.Transport.setup(self, register_select_pin, reset_pin)
+        self.transport.register_select_pin = register_select_pin
+        self.transport.reset_pin = reset_pin
+
+    def record(self, data, delay_usecs):
+        timestamp = time.monotonic()
+        register_select = 0xFF if self.register_select is None else self.register_select
+
+        records = []
+        start = 1
+        for byte in data:
+            records.append(RECORD.pack(timestamp, register_select, self.instruction_set,
+                                       start, byte, delay_usecs))
+            start = 0
+
+            # the instruction set in effect is only known from the bytes sent
+            if register_select == st7036_transport.LOW and _is_function_set(byte):
+                self.instruction_set = byte & 0b00000011
+
+        self.file.write(b''.join(records))
+
+    def flush(self):
+        """
+        Writes recorded bytes through to the trace file.
+        """
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+        self.transport.close()
+
+
+class _TracingBus(object):
+    def __init__(self, trace, spi):
+        self._trace = trace
+        self._spi = spi
+
+    def __getattr__(self, name):
+        return getattr(self._spi, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._spi, name, value)
+
+    def xfer(self, data, speed_hz=0, delay_usecs=0):
+        self._trace.record(data, delay_usecs)
+        return self._spi.xfer(data, speed_hz, delay_usecs)
+
+
+class _TracingGPIO(object):
+    def __init__(self, trace, gpio):
+        self._trace = trace
+        self._gpio = gpio
+
+    def __getattr__(self, name):
+        return getattr(self._gpio, name)
+
+    def output(self, pin, level):
+        if pin == self._trace.register_select_pin:
+            self._trace.register_select = level
+        self._gpio.output(pin, level)
+
+
+def read(path):
+    """
+    Reads a trace file.
+
+    Returns:
+        list: a Record for every byte, in the order sent
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    # ignore a partly written record at the end
+    data = data[:len(data) - len(data) % RECORD.size]
+    return [Record(*fields) for fields in RECORD.iter_unpack(data)]
+
+
+def transfers(records):
+    """
+    Groups records back into the transfers they were sent in.
+
+    Returns:
+        list: (timestamp, register_select, data, delay_usecs) per transfer
+    """
+    grouped = []
+    for record in records:
+        if record.start or not grouped:
+            grouped.append((record.timestamp, record.register_select, [record.byte], record.delay_usecs))
+        else:
+            grouped[-1][2].append(record.byte)
+    return grouped
+
+
+def replay(records, transport, speed=1.0, timing=st7036_timing.DATASHEET):
+    """
+    Sends a trace again, to a display or a FakeTransport.
+
+    The transport must already be set up with the register select pin.
+
+    Args:
+        records (list): Records, from read()
+        transport (Transport): where to send them
+        speed (float): replay this many times faster than recorded, or
+            None to drop the idle time and wait only what the controller
+            needs after each transfer, according to timing
+        timing (TimingProfile): delays for replay with speed=None
+    """
+    register_select = None
+    first = None
+    start = time.monotonic()
+
+    for timestamp, level, data, delay_usecs in transfers(records):
+        if speed is not None:
+            if first is None:
+                first = timestamp
+            due = start + (timestamp - first) / speed
+            now = time.monotonic()
+            if due > now:
+                timing.wait(due - now)
+
+        if level != register_select and level != 0xFF:
+            transport.gpio.output(transport.register_select_pin, level)
+            register_select = level
+
+        transport.spi.xfer(data, 0, delay_usecs)
+
+        if speed is None:
+            byte = data[-1]
+            if level == st7036_transport.LOW and (byte == COMMAND_CLEAR or byte & 0b11111110 == COMMAND_HOME):
+                # a clear or home can end a batch of commands, spidev
+                # only spaced it by delay_usecs
+                timing.wait(max(0, timing.clear - delay_usecs / 1000000.0))
+            elif len(data) == 1 or delay_usecs == 0:
+                timing.wait(timing.command if level == st7036_transport.LOW else timing.data)
+
+
+def analyse(records, rows=3):
+    """
+    Works out which bytes in a trace changed nothing on the display.
+
+    The controller state is followed from the bytes alone: the address
+    counter, DDRAM and CGRAM contents and the instruction set. Nothing is
+    known about DDRAM or CGRAM until the trace writes or clears them.
+
+    Args:
+        records (list): Records, from read()
+        rows (int): rows of the display traced, which with the 2 line
+            bit of the function set decides how the address counter
+            moves from one line to the next
+
+    Returns:
+        dict: counts of bytes by kind and of wasted bytes:
+            instruction_set_resends, function set bytes repeating the one
+                in effect
+            unchanged_cells, DDRAM writes of the byte already there
+            duplicate_glyphs, uploads of a whole glyph CGRAM already held
+            unchanged_cgram_bytes, CGRAM writes of the byte already there
+    """
+    ddram = [None] * 0x80
+    cgram = [None] * 0x40
+    address = None
+    in_cgram = False
+    function_set = None
+    glyph_writes = {}
+    steps = {}
+
+    result = {
+        'bytes': len(records),
+        'transfers': 0,
+        'commands': 0,
+        'data': 0,
+        'instruction_set_resends': 0,
+        'unchanged_cells': 0,
+        'duplicate_glyphs': 0,
+        'unchanged_cgram_bytes': 0,
+        'duration_s': records[-1].timestamp - records[0].timestamp if records else 0.0,
+    }
+
+    for record in records:
+        # the driver sets the 2 line bit unless told otherwise
+        two_line_mode = function_set is None or bool(function_set & 0b00001000)
+        if two_line_mode not in steps:
+            steps[two_line_mode] = st7036.address_steps(rows, two_line_mode)
+        next_address, previous_address = steps[two_line_mode]
+
+        byte = record.byte
+        if record.start:
+            result['transfers'] += 1
+
+        if record.register_select == st7036_transport.LOW:
+            result['commands'] += 1
+            instruction_set = function_set & 0b11 if function_set is not None else None
+
+            if _is_function_set(byte):
+                if byte == function_set:
+                    result['instruction_set_resends'] += 1
+                function_set = byte
+            elif byte & 0b10000000:
+                address = byte & 0b01111111
+                in_cgram = False
+            elif byte & 0b01000000 and instruction_set == 0:
+                address = byte & 0b00111111
+                in_cgram = True
+                glyph_writes = {}
+            elif byte & 0b11111000 == 0b00010000 and instruction_set == 0:
+                if address is not None and not in_cgram:
+                    address = (next_address if byte & 0b00000100 else previous_address)[address]
+            elif byte == COMMAND_CLEAR:
+                ddram = [0x20] * 0x80
+                address = 0
+                in_cgram = False
+            elif byte & 0b11111110 == COMMAND_HOME:
+                address = 0
+                in_cgram = False
+            continue
+
+        result['data'] += 1
+        if address is None:
+            continue
+
+        if in_cgram:
+            if cgram[address] == byte:
+                result['unchanged_cgram_bytes'] += 1
+                slot = address // 8
+                glyph_writes[slot] = glyph_writes.get(slot, 0) + 1
+                if glyph_writes[slot] == 8:
+                    result['duplicate_glyphs'] += 1
+            cgram[address] = byte
+            address = (address + 1) % 0x40
+        else:
+            if ddram[address] == byte:
+                result['unchanged_cells'] += 1
+            ddram[address] = byte
+            address = next_address[address]
+
+    result['wasted_bytes'] = (result['instruction_set_resends'] + result['unchanged_cells'] +
+                              result['unchanged_cgram_bytes'])
+    return result
+
+
+def report(result, out=sys.stdout):
+    for key in ('bytes', 'transfers', 'commands', 'data', 'duration_s',
+                'instruction_set_resends', 'unchanged_cells', 'duplicate_glyphs',
+                'unchanged_cgram_bytes', 'wasted_bytes'):
+        value = result[key]
+        out.write("%-26s%s\n" % (key, ("%.6f" if isinstance(value, float) else "%d") % value))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.stderr.write("usage: %s TRACE [ROWS]\n" % sys.argv[0])
+        sys.exit(2)
+
+    report(analyse(read(sys.argv[1]), int(sys.argv[2]) if len(sys.argv) == 3 else 3))
@@ -0,0 +1,251 @@
+import os
+import time
+
+LOW = 0
+HIGH = 1
+
+
+class Transport(object):
+    """
+    The SPI bus and GPIO pins a display is wired to.
+
+    spi must behave like spidev.SpiDev: a max_speed_hz attribute and
+    xfer(data, speed_hz=0, delay_usecs=0). gpio needs setup(pin),
+    output(pin, level) and close().
+    """
+    def __init__(self, spi, gpio):
+        self.spi = spi
+        self.gpio = gpio
+        self.register_select_pin = None
+        self.reset_pin = None
+
+    def setup(self, register_select_pin, reset_pin=None):
+        """
+        Configures the display's pins as outputs.
+        """
+        self.register_select_pin = register_select_pin
+        self.reset_pin = reset_pin
+
+        if reset_pin is not None:
+            self.gpio.setup(reset_pin)
+        self.gpio.setup(register_select_pin)
+
+    def close(self):
+        self.spi.close()
+        self.gpio.close()
+
+
+def spidev_bus(bus=0, device=0):
+    """
+    Opens /dev/spidev<bus>.<device> with the spidev module.
+    """
+    import spidev
+
+    spi = spidev.SpiDev()
+    spi.open(bus, device)
+    return spi
+
+
+def default_transport(bus=0, device=0):
+    """
+    spidev for SPI and RPi.GPIO for the pins, as on a Raspberry Pi.
+    """
+    return Transport(spidev_bus(bus, device), RPiGPIO())
+
+
+class RPiGPIO(object):
+    """
+    Pins driven through RPi.GPIO, numbered BCM.
+    """
+    def __init__(self):
+        import RPi.GPIO as GPIO
+
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        self._gpio = GPIO
+
+    def setup(self, pin):
+        self._gpio.setup(pin, self._gpio.OUT)
+
+    def output(self, pin, level):
+        self._gpio.output(pin, level)
+
+    def close(self):
+        pass
+
+
+class GpiodGPIO(object):
+    """
+    Pins driven through the libgpiod (v1) Python bindings, numbered by
+    line offset on the chip.
+    """
+    def __init__(self, chip='gpiochip0', consumer='st7036'):
+        import gpiod
+
+        self._gpiod = gpiod
+        self._chip = gpiod.Chip(chip)
+        self._consumer = consumer
+        self._lines = {}
+
+    def setup(self, pin):
+        line = self._chip.get_line(pin)
+        line.request(consumer=self._consumer, type=self._gpiod.LINE_REQ_DIR_OUT)
+        self._lines[pin] = line
+
+    def output(self, pin, level):
+        self._lines[pin].set_value(level)
+
+    def close(self):
+        for line in self._lines.values():
+            line.release()
+        self._lines = {}
+        self._chip.close()
+
+
+# struct spi_ioc_transfer, defined by the first IoctlBus so importing
+# this module does not load ctypes
+_spi_ioc_transfer = None
+
+
+def _transfer_type(ctypes):
+    global _spi_ioc_transfer
+    if _spi_ioc_transfer is None:
+        class spi_ioc_transfer(ctypes.Structure):
+            _fields_ = [
+                ('tx_buf', ctypes.c_uint64),
+                ('rx_buf', ctypes.c_uint64),
+                ('len', ctypes.c_uint32),
+                ('speed_hz', ctypes.c_uint32),
+                ('delay_usecs', ctypes.c_uint16),
+                ('bits_per_word', ctypes.c_uint8),
+                ('cs_change', ctypes.c_uint8),
+                ('tx_nbits', ctypes.c_uint8),
+                ('rx_nbits', ctypes.c_uint8),
+                ('word_delay_usecs', ctypes.c_uint8),
+                ('pad', ctypes.c_uint8),
+            ]
+        _spi_ioc_transfer = spi_ioc_transfer
+    return _spi_ioc_transfer
+
+
+def _ioc_write(number, size):
+    # _IOW(SPI_IOC_MAGIC, number, size) from linux/spi/spidev.h
+    return (1 << 30) | (size << 16) | (ord('k') << 8) | number
+
+_SPI_IOC_WR_MAX_SPEED_HZ = _ioc_write(4, 4)
+
+
+class IoctlBus(object):
+    """
+    Talks to a spidev character device with raw ioctls, for systems
+    without the spidev Python module.
+
+    Like spidev's xfer(), each byte is its own transfer within a single
+    SPI_IOC_MESSAGE so delay_usecs spaces them out.
+    """
+    def __init__(self, bus=0, device=0):
+        import ctypes
+        import fcntl
+        import struct
+
+        self._ctypes = ctypes
+        self._struct = struct
+        self._transfer_type = _transfer_type(ctypes)
+        self._ioctl = fcntl.ioctl
+        self._fd = os.open('/dev/spidev%d.%d' % (bus, device), os.O_RDWR)
+        self._max_speed_hz = 0
+
+    @property
+    def max_speed_hz(self):
+        return self._max_speed_hz
+
+    @max_speed_hz.setter
+    def max_speed_hz(self, speed_hz):
+        self._ioctl(self._fd, _SPI_IOC_WR_MAX_SPEED_HZ, self._struct.pack('=I', speed_hz))
+        self._max_speed_hz = speed_hz
+
+    def xfer(self, data, speed_hz=0, delay_usecs=0):
+        ctypes = self._ctypes
+        count = len(data)
+        tx = (ctypes.c_uint8 * count)(*data)
+        rx = (ctypes.c_uint8 * count)()
+        transfers = (self._transfer_type * count)()
+
+        for i in range(count):
+            transfer = transfers[i]
+            transfer.tx_buf = ctypes.addressof(tx) + i
+            transfer.rx_buf = ctypes.addressof(rx) + i
+            transfer.len = 1
+            transfer.speed_hz = speed_hz
+            transfer.delay_usecs = delay_usecs
+
+        self._ioctl(self._fd, _ioc_write(0, ctypes.sizeof(transfers)), transfers)
+        return list(rx)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class FakeTransport(Transport):
+    """
+    Records what the driver sends instead of talking to hardware.
+
+    Attributes:
+        events (list): (register_select, byte, timestamp) for every byte sent
+        transfers (list): (register_select, data, delay_usecs, timestamp)
+            for every xfer() call
+        outputs (list): (pin, level, timestamp) for every GPIO write
+    """
+    def __init__(self, clock=time.monotonic):
+        Transport.__init__(self, _FakeBus(self), _FakeGPIO(self))
+        self.clock = clock
+        self.levels = {}
+        self.events = []
+        self.transfers = []
+        self.outputs = []
+
+    def clear(self):
+        """
+        Forgets everything recorded so far.
+        """
+        del self.events[:]
+        del self.transfers[:]
+        del self.outputs[:]
+
+
+class _FakeBus(object):
+    def __init__(self, transport):
+        self._transport = transport
+        self.max_speed_hz = 0
+
+    def xfer(self, data, speed_hz=0, delay_usecs=0):
+        transport = self._transport
+        timestamp = transport.clock()
+        register_select = transport.levels.get(transport.register_select_pin)
+        data = tuple(data)
+
+        transport.transfers.append((register_select, data, delay_usecs, timestamp))
+        for byte in data:
+            transport.events.append((register_select, byte, timestamp))
+        return [0] * len(data)
+
+    def close(self):
+        pass
+
+
+class _FakeGPIO(object):
+    def __init__(self, transport):
+        self._transport = transport
+
+    def setup(self, pin):
+        self._transport.levels.setdefault(pin, None)
+
+    def output(self, pin, level):
+        transport = self._transport
+        transport.levels[pin] = level
+        transport.outputs.append((pin, level, transport.clock()))
+
+    def close(self):
+        pass
@@ -0,0 +1,526 @@
+import time
+import weakref
+from array import array
+
+import st7036_codec
+import st7036_glyphs
+
+LEFT = 'left'
+RIGHT = 'right'
+CENTER = 'center'
+
+# Bars 1 to 8 pixels high, for Sparkline
+VERTICAL_LEVELS = [[0] * (8 - height) + [0b11111] * height for height in range(1, 9)]
+
+# Bars 1 to 5 pixels wide, for ProgressBar
+HORIZONTAL_LEVELS = [[(0b11111 << (5 - width)) & 0b11111] * 8 for width in range(1, 6)]
+
+# GlyphCache per display, shared by its widgets
+_glyph_caches = weakref.WeakKeyDictionary()
+
+
+def glyph_cache(lcd):
+    """
+    Returns:
+        GlyphCache: the cache graph widgets on lcd share its CGRAM through
+    """
+    cache = _glyph_caches.get(lcd)
+    if cache is None:
+        cache = st7036_glyphs.GlyphCache(lcd)
+        _glyph_caches[lcd] = cache
+    return cache
+
+
+class Widget(object):
+    """
+    A fixed region of one row showing a value.
+
+    Setting a value that is already shown costs nothing, otherwise only
+    the cells from the first to the last one that changed are sent. The
+    region is always fully overwritten, so text never needs padding with
+    spaces to wipe out a longer value.
+
+    With the display's framebuffer enabled cells are drawn into it
+    instead, for the next flush().
+
+    Columns and rows are cells on screen, either way. While the display
+    is shifted, by a Marquee or show_page(), the widget is drawn into
+    whichever DDRAM addresses are shown.
+    """
+    def __init__(self, lcd, column, row, width, align=LEFT, value=None):
+        """
+        Args:
+            lcd (st7036): display to show the widget on
+            column (int): first column of the region
+            row (int): row of the region
+            width (int): number of columns in the region
+            align (string): LEFT, RIGHT or CENTER
+            value: initial value, shown straight away unless None
+        Raises:
+            ValueError: if the region does not fit on the display
+        """
+        if row not in range(lcd.rows) or column not in range(lcd.columns) or \
+                width < 1 or column + width > lcd.columns:
+            raise ValueError("widget must fit within the defined screen size")
+        if align not in (LEFT, RIGHT, CENTER):
+            raise ValueError("align must be one of %r, %r or %r" % (LEFT, RIGHT, CENTER))
+
+        self.lcd = lcd
+        self.column = column
+        self.row = row
+        self.width = width
+        self.align = align
+
+        self.value = None
+        self._shown = None
+
+        if value is not None:
+            self.set(value)
+
+    def set(self, value):
+        """
+        Shows a new value.
+
+        Returns:
+            int: number of cells sent
+        """
+        if value == self.value and self._shown is not None:
+            return 0
+
+        self.value = value
+        return self.render()
+
+    def format(self, value):
+        """
+        Turns a value into text, subclasses override this.
+        """
+        return '' if value is None else '%s' % (value,)
+
+    def prepare(self, text):
+        """
+        Last chance to change fitted text before it is sent, graph
+        widgets swap glyphs for their CGRAM slots here.
+        """
+        return text
+
+    def fit(self, text):
+        """
+        Truncates or pads text to exactly the width of the region.
+        """
+        text = text[:self.width]
+        if self.align == RIGHT:
+            return text.rjust(self.width)
+        if self.align == CENTER:
+            return text.center(self.width)
+        return text.ljust(self.width)
+
+    def render(self):
+        """
+        Sends the cells that differ from what the widget last showed.
+
+        Returns:
+            int: number of cells sent
+        """
+        text = self.prepare(self.fit(self.format(self.value)))
+        shown = self._shown
+
+        if shown is None:
+            first, last = 0, self.width - 1
+        else:
+            changed = [i for i in range(self.width) if text[i] != shown[i]]
+            if not changed:
+                return 0
+            first, last = changed[0], changed[-1]
+
+        span = text[first:last + 1]
+        lcd = self.lcd
+        if lcd.framebuffer is not None:
+            lcd.draw(self.column + first, self.row, span)
+        else:
+            with lcd.lock:
+                _write_cells(lcd, self.column + first, self.row, span)
+
+        self._shown = text
+        return len(span)
+
+    def invalidate(self):
+        """
+        Forgets what is on screen, so the next set() or render() redraws
+        the whole region. Call after clearing the display.
+        """
+        self._shown = None
+
+
+def _write_cells(lcd, column, row, text):
+    # a shifted row wraps round the end of its DDRAM line, where the
+    # address counter goes on to the next line instead
+    offset = lcd.cell_offset(column, row)
+    start = lcd.row_offsets[row]
+    before_wrap = start + lcd.line_length - offset
+
+    lcd.set_cursor_offset(offset)
+    lcd.write(text[:before_wrap])
+    if len(text) > before_wrap:
+        lcd.set_cursor_offset(start)
+        lcd.write(text[before_wrap:])
+
+
+class TextField(Widget):
+    """
+    Text, clipped to the region.
+    """
+    pass
+
+
+class NumberField(Widget):
+    """
+    A number formatted with a %-style format, right aligned by default.
+    Numbers too wide for the region show as #, rather than being cut
+    into a misleading value.
+    """
+    def __init__(self, lcd, column, row, width, format='%d', align=RIGHT, value=None):
+        self.number_format = format
+        Widget.__init__(self, lcd, column, row, width, align, value)
+
+    def format(self, value):
+        if value is None:
+            return ''
+        text = self.number_format % value
+        if len(text) > self.width:
+            return '#' * self.width
+        return text
+
+
+class Clock(Widget):
+    """
+    The time, formatted with time.strftime(). Call update() as often as
+    convenient, cells are only sent when the text changes.
+    """
+    def __init__(self, lcd, column, row, format='%H:%M:%S', width=None, align=LEFT, clock=time.time):
+        self.time_format = format
+        self.clock = clock
+        if width is None:
+            width = len(time.strftime(format, time.localtime(0)))
+        Widget.__init__(self, lcd, column, row, width, align)
+
+    def update(self, now=None):
+        """
+        Returns:
+            int: number of cells sent
+        """
+        if now is None:
+            now = self.clock()
+        return self.set(time.strftime(self.time_format, time.localtime(now)))
+
+
+class Sparkline(Widget):
+    """
+    A bar per sample, newest on the right, scrolling left as samples are
+    added.
+
+    Samples are quantised to 9 levels, blank and 1 to 8 pixels, and kept
+    in a ring buffer as large as the region, so adding one allocates
+    nothing. Only the cells whose level changed are sent.
+
+    The 8 bar glyphs are reserved in the display's glyph_cache(), which
+    takes every CGRAM slot. Other Sparklines share them, but no other
+    glyphs fit alongside, so a ProgressBar on the same display raises
+    ValueError.
+    """
+    def __init__(self, lcd, column, row, width, minimum=0, maximum=100, glyphs=None):
+        """
+        Args:
+            minimum (float): sample shown as an empty cell
+            maximum (float): sample shown as a full cell
+            glyphs (GlyphCache): cache for the bar glyphs, defaults to the
+                one the display's graph widgets share
+        Raises:
+            ValueError: if the bar glyphs do not fit beside the glyphs
+                already reserved in the cache
+        """
+        if maximum <= minimum:
+            raise ValueError("maximum must be greater than minimum")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.glyphs = glyphs if glyphs is not None else glyph_cache(lcd)
+        self._characters = [' '] + [self.glyphs.register(bitmap) for bitmap in VERTICAL_LEVELS]
+        self.glyphs.reserve(self._characters[1:])
+
+        self._levels = array('B', [0] * width)
+        self._next = 0
+
+        Widget.__init__(self, lcd, column, row, width)
+
+    def level(self, sample):
+        """
+        Returns:
+            int: the level a sample is shown at, 0 to 8
+        """
+        level = int(round(8.0 * (sample - self.minimum) / (self.maximum - self.minimum)))
+        return min(8, max(0, level))
+
+    def add(self, sample):
+        """
+        Adds a sample, scrolling the older ones left.
+
+        Returns:
+            int: number of cells sent
+        """
+        self._levels[self._next] = self.level(sample)
+        self._next = (self._next + 1) % self.width
+        return self.render()
+
+    def set(self, value):
+        return self.add(value)
+
+    def format(self, value):
+        characters = self._characters
+        levels = self._levels
+        start = self._next
+        return ''.join([characters[levels[(start + i) % self.width]] for i in range(self.width)])
+
+    def prepare(self, text):
+        return self.glyphs.prepare(text)
+
+
+class ProgressBar(Widget):
+    """
+    A horizontal bar filling the region from the left, with 5 steps per
+    cell.
+
+    Its 5 glyphs are reserved in the display's glyph_cache(), shared with
+    other ProgressBars and leaving 3 CGRAM slots for other glyphs. That
+    is too few for a Sparkline on the same display.
+    """
+    def __init__(self, lcd, column, row, width, minimum=0, maximum=100, glyphs=None, value=None):
+        if maximum <= minimum:
+            raise ValueError("maximum must be greater than minimum")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.glyphs = glyphs if glyphs is not None else glyph_cache(lcd)
+        self._characters = [' '] + [self.glyphs.register(bitmap) for bitmap in HORIZONTAL_LEVELS]
+        self.glyphs.reserve(self._characters[1:])
+
+        Widget.__init__(self, lcd, column, row, width, LEFT, value)
+
+    def format(self, value):
+        if value is None:
+            return ''
+
+        steps = 5 * self.width
+        filled = int(round(steps * (value - self.minimum) / float(self.maximum - self.minimum)))
+        filled = min(steps, max(0, filled))
+
+        full, part = divmod(filled, 5)
+        text = self._characters[5] * full
+        if part:
+            text += self._characters[part]
+        return text
+
+    def prepare(self, text):
+        return self.glyphs.prepare(text)
+
+
+class Marquee(Widget):
+    """
+    Text scrolling left through the region a column per step(), wrapping
+    round after a gap.
+
+    A marquee spanning a whole row of a 1 or 2 row display scrolls with
+    the controller's display shift. The row's DDRAM line holds more
+    characters than are visible, so the text is loaded ahead into the
+    hidden part and each step() is a single shift command. Text that
+    fits in the line, gap included, is loaded once and never sent again,
+    longer text is topped up in one burst each time the loaded part runs
+    out. Display shift moves every row at once: anything else on the
+    display scrolls along with it.
+
+    Otherwise, or with hardware=False, each step() sends the cells that
+    changed, like any other widget.
+    """
+    def __init__(self, lcd, row, text, column=0, width=None, gap=4, hardware=None):
+        """
+        Args:
+            text (string): text to scroll
+            gap (int): spaces between the end of the text and its start
+            hardware (bool): scroll with display shift, by default
+                whenever the region allows it
+        Raises:
+            ValueError: if hardware is True and the region is not a whole
+                row of a 1 or 2 row display
+        """
+        if width is None:
+            width = lcd.columns - column
+
+        Widget.__init__(self, lcd, column, row, width)
+
+        whole_row = column == 0 and width == lcd.columns and lcd.rows < 3
+        if hardware is None:
+            hardware = whole_row
+        elif hardware and not whole_row:
+            raise ValueError("hardware scrolling needs a whole row of a 1 or 2 row display")
+
+        self.hardware = hardware
+        self.gap = gap
+        self.position = 0
+        self._loop = None
+        self._loaded = None
+
+        self.set(text)
+
+    def set(self, value):
+        """
+        Shows new text, from its start.
+
+        Returns:
+            int: number of cells sent
+        """
+        if value == self.value and self._loop is not None:
+            return 0
+
+        loop = ('' if value is None else '%s' % (value,)) + ' ' * self.gap
+        if self.hardware and len(loop) < self.lcd.line_length:
+            # a loop exactly the length of the line never needs reloading
+            loop = loop.ljust(self.lcd.line_length)
+
+        self.value = value
+        self.position = 0
+        self._loop = loop or ' '
+        return self.render()
+
+    def step(self):
+        """
+        Scrolls one column left.
+
+        Returns:
+            int: number of cells sent
+        """
+        self.position = (self.position + 1) % len(self._loop)
+        if not self.hardware:
+            return self.render()
+
+        lcd = self.lcd
+        with lcd.lock:
+            sent = self._load(lcd.display_shift + 1)
+            lcd.shift_left()
+        return sent
+
+    def format(self, value):
+        loop = self._loop
+        text = loop * (self.width // len(loop) + 2)
+        return text[self.position:self.position + self.width]
+
+    def render(self):
+        if not self.hardware:
+            return Widget.render(self)
+
+        lcd = self.lcd
+        with lcd.lock:
+            return self._load(lcd.display_shift)
+
+    def invalidate(self):
+        Widget.invalidate(self)
+        self._loaded = None
+
+    def _load(self, shift):
+        """
+        Makes sure the row's DDRAM line holds the text as it will be shown
+        with the display shifted by shift, loading the line afresh if any
+        visible cell would be wrong.
+        """
+        lcd = self.lcd
+        length = lcd.line_length
+        loop = self._loop
+
+        # column c of the display shows DDRAM address (shift + c) % length,
+        # columns past the right edge come into view with later steps
+        wanted = [None] * length
+        for column in range(length):
+            wanted[(shift + column) % length] = loop[(self.position + column) % len(loop)]
+
+        loaded = self._loaded
+        if loaded is None:
+            loaded = self._loaded = [None] * length
+        elif all(loaded[(shift + column) % length] == wanted[(shift + column) % length]
+                 for column in range(self.width)):
+            return 0
+
+        base = lcd.row_offsets[self.row]
+        sent = 0
+        address = 0
+        while address < length:
+            if loaded[address] == wanted[address]:
+                address += 1
+                continue
+
+            start = address
+            while address < length and loaded[address] != wanted[address]:
+                address += 1
+
+            text = ''.join(wanted[start:address])
+            lcd.set_cursor_offset(base + start)
+            lcd.write(text)
+            if lcd.framebuffer is not None:
+                # keep flush() from putting back what the framebuffer held
+                data = st7036_codec.encode(text, lcd.encoding_errors)
+                lcd.framebuffer[base + start:base + start + len(data)] = data
+
+            loaded[start:address] = wanted[start:address]
+            sent += address - start
+
+        return sent
+
+
+class Screen(object):
+    """
+    A set of widgets on one display.
+    """
+    def __init__(self, lcd):
+        self.lcd = lcd
+        self.widgets = []
+
+    def add(self, widget):
+        """
+        Adds a widget.
+
+        Returns:
+            Widget: the widget
+        Raises:
+            ValueError: if it overlaps a widget already on the screen
+        """
+        for other in self.widgets:
+            if other.row == widget.row and \
+                    other.column < widget.column + widget.width and \
+                    widget.column < other.column + other.width:
+                raise ValueError("widget overlaps another widget")
+
+        self.widgets.append(widget)
+        return widget
+
+    def update(self, now=None):
+        """
+        Updates every clock.
+
+        Returns:
+            int: number of cells sent
+        """
+        return sum(widget.update(now) for widget in self.widgets if isinstance(widget, Clock))
+
+    def invalidate(self):
+        """
+        Redraws every widget in full on its next update, after the
+        display has been cleared.
+        """
+        for widget in self.widgets:
+            widget.invalidate()
+
+    def render(self):
+        """
+        Sends whatever differs on every widget.
+
+        Returns:
+            int: number of cells sent
+        """
+        return sum(widget.render() for widget in self.widgets)
@@ -0,0 +1,208 @@
+import threading
+
+
+class DisplayWorker(object):
+    """
+    Gives a display a single thread that owns the bus, fed by any number
+    of producer threads.
+
+    Producers only queue operations, which takes a short lock and never
+    waits on SPI. Before each round of bus work the worker folds together
+    whatever has queued up: text is drawn into the display's framebuffer
+    and sent with one flush(), so repeated writes to the same cells cost
+    nothing extra, and only the latest contrast, display mode and bitmap
+    for each glyph slot are sent.
+    """
+    def __init__(self, lcd, start=True):
+        """
+        Args:
+            lcd (st7036): display, created with framebuffer=True
+            start (bool): start the worker thread straight away
+        Raises:
+            ValueError: if the display has no framebuffer
+        """
+        if lcd.framebuffer is None:
+            raise ValueError("DisplayWorker needs a display created with framebuffer=True")
+
+        self.lcd = lcd
+
+        self._condition = threading.Condition()
+        self._draws = []
+        self._glyphs = {}
+        self._settings = {}
+
+        # operations queued and operations on the display, for sync()
+        self._queued = 0
+        self._done = 0
+
+        self._thread = None
+        self._stop = False
+        self.error = None
+
+        # settings, glyphs and text dropped in favour of later ones
+        self.coalesced = 0
+
+        if start:
+            self.start()
+
+    def write_at(self, column, row, value):
+        """
+        Queues text to be written at a position.
+
+        Raises:
+            ValueError: if row and column are not within defined screen size
+        """
+        if row not in range(self.lcd.rows) or column not in range(self.lcd.columns):
+            raise ValueError("row and column must integers within the defined screen size")
+
+        self._submit(self._add_draw, (column, row, value))
+
+    def clear(self):
+        """
+        Queues clearing the display, dropping text queued before it.
+        """
+        self._submit(self._clear_draws)
+
+    def create_char(self, char_pos, char_map):
+        """
+        Queues a glyph upload.
+
+        Raises:
+            ValueError: if char_pos is not in the range 0..7, or char_map
+                does not have 8 rows
+        """
+        if char_pos not in range(8):
+            raise ValueError("char_pos must be an integer in the range 0..7")
+
+        bitmap = tuple(char_map)
+        if len(bitmap) != 8:
+            raise ValueError("char_map must have 8 rows")
+
+        self._submit(self._replace, self._glyphs, char_pos, bitmap)
+
+    def set_contrast(self, contrast):
+        """
+        Queues a contrast change.
+
+        Raises:
+            TypeError: if contrast is not an int
+            ValueError: if contrast is not in the range 0..0x3F
+        """
+        if type(contrast) is not int:
+            raise TypeError("contrast must be an integer")
+
+        if contrast not in range(0, 0x40):
+            raise ValueError("contrast must be an integer in the range 0..0x3F")
+
+        self._submit(self._replace, self._settings, 'set_contrast', (contrast,))
+
+    def set_display_mode(self, enable=True, cursor=False, blink=False):
+        """
+        Queues a display mode change.
+        """
+        self._submit(self._replace, self._settings, 'set_display_mode', (enable, cursor, blink))
+
+    def sync(self, timeout=None):
+        """
+        Waits until everything queued so far has been sent.
+
+        Returns:
+            bool: False if the timeout ran out first
+        Raises:
+            RuntimeError: if the worker thread failed
+        """
+        with self._condition:
+            target = self._queued
+            done = self._condition.wait_for(lambda: self._done >= target or self.error is not None,
+                                            timeout)
+            self._check()
+            return done
+
+    def start(self):
+        """
+        Starts the worker thread.
+        """
+        if self._thread is not None:
+            return
+
+        self._stop = False
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Sends whatever is still queued and stops the worker thread.
+        """
+        if self._thread is None:
+            return
+
+        with self._condition:
+            self._stop = True
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+
+    def _submit(self, function, *args):
+        with self._condition:
+            self._check()
+            function(*args)
+            self._queued += 1
+            self._condition.notify()
+
+    def _check(self):
+        if self.error is not None:
+            raise RuntimeError("display worker failed: %r" % (self.error,))
+
+    def _add_draw(self, draw):
+        self._draws.append(draw)
+
+    def _clear_draws(self):
+        self.coalesced += len(self._draws)
+        self._draws = [None]
+
+    def _replace(self, pending, key, value):
+        if key in pending:
+            self.coalesced += 1
+        pending[key] = value
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queued > self._done or self._stop)
+                if self._queued == self._done:
+                    return
+
+                draws, self._draws = self._draws, []
+                glyphs, self._glyphs = self._glyphs, {}
+                settings, self._settings = self._settings, {}
+                target = self._queued
+
+            try:
+                self._apply(draws, glyphs, settings)
+            except Exception as error:
+                with self._condition:
+                    self.error = error
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._done = target
+                self._condition.notify_all()
+
+    def _apply(self, draws, glyphs, settings):
+        lcd = self.lcd
+        with lcd.lock:
+            for name, args in settings.items():
+                getattr(lcd, name)(*args)
+
+            # glyphs go up before the text that may use them
+            lcd.create_chars(glyphs)
+
+            for draw in draws:
+                if draw is None:
+                    lcd.clear_framebuffer()
+                else:
+                    lcd.draw(*draw)
+
+            lcd.flush()
@@ -0,0 +1,337 @@
+"""
+Checks the driver's shadow state against the emulator, run with:
+
+    python -m pytest test_st7036.py
+"""
+
+import asyncio
+import atexit
+import os
+import shutil
+import tempfile
+import unittest
+
+import st7036
+import st7036_async
+import st7036_benchmark
+import st7036_emulator
+import st7036_glyphs
+import st7036_multi
+import st7036_present
+import st7036_timing
+import st7036_trace
+import st7036_transport
+import st7036_worker
+import st7036_widgets
+
+
+def _display(rows=2, columns=16, **options):
+    emulator = st7036_emulator.Emulator(rows, columns)
+    lcd = st7036.st7036(25, rows=rows, columns=columns,
+                        transport=st7036_emulator.EmulatorTransport(emulator),
+                        timing=st7036_benchmark.RecordingTiming(), **options)
+    return lcd, emulator
+
+
+def _shown(emulator):
+    return b''.join(codes for codes, height in emulator.cells())
+
+
+class AddressCounterTest(unittest.TestCase):
+    def test_write_across_line_end(self):
+        for rows in (1, 2, 3):
+            lcd, emulator = _display(rows)
+            lcd.set_cursor_offset(0x20)
+            lcd.write("ABCDEFGHIJKL")
+
+            self.assertEqual(lcd._cursor_offset, emulator.address)
+            self.assertEqual(lcd.visible_bytes(), _shown(emulator))
+
+    def test_single_line_without_two_line_bit(self):
+        lcd, emulator = _display(1, instruction_set_template=0b00110000)
+        lcd.set_cursor_offset(0x4C)
+        lcd.write("ABCDEFGH")
+
+        self.assertEqual(lcd._cursor_offset, emulator.address)
+        self.assertEqual(bytes(lcd._ddram[:0x50]), bytes(emulator.ddram[:0x50]))
+
+    def test_cursor_moves_across_line_end(self):
+        lcd, emulator = _display(2)
+        lcd.set_cursor_offset(0x27)
+        lcd.cursor_right()
+        self.assertEqual(lcd._cursor_offset, 0x40)
+        lcd.cursor_left()
+        lcd.cursor_left()
+        self.assertEqual(lcd._cursor_offset, emulator.address)
+
+    def test_flush_after_wrapped_write(self):
+        lcd, emulator = _display(2, framebuffer=True)
+        lcd.set_cursor_offset(0x20)
+        lcd.write("ABCDEFGHIJKL")
+
+        lcd.draw(0, 1, " " * 16)
+        lcd.flush()
+
+        self.assertEqual(lcd.visible_bytes(), _shown(emulator))
+        self.assertEqual(emulator.text()[1], " " * 16)
+
+
+class CreateCharsTest(unittest.TestCase):
+    def test_char_maps_need_8_rows(self):
+        lcd, emulator = _display(2)
+        self.assertRaises(ValueError, lcd.create_chars, [[0b11111] * 8, [0b10101] * 7, [0b01010] * 8])
+        self.assertRaises(ValueError, lcd.create_char, 0, [0b11111] * 9)
+
+    def test_run_of_slots(self):
+        lcd, emulator = _display(2)
+        lcd.create_chars([[row] * 8 for row in (1, 2, 3)], 4)
+        self.assertEqual(bytes(emulator.cgram[32:56]), bytes([1] * 8 + [2] * 8 + [3] * 8))
+
+
+class GlyphCacheTest(unittest.TestCase):
+    def test_glyphs_come_back_after_reset(self):
+        lcd, emulator = _display(2, reset_pin=12)
+        cache = st7036_glyphs.GlyphCache(lcd)
+        heart = cache.register([0, 0b01010, 0b11111, 0b11111, 0b01110, 0b00100, 0, 0])
+        cache.write(heart)
+        uploaded = bytes(emulator.cgram[:8])
+
+        lcd.reset()
+        lcd.restore()
+        lcd.home()
+        cache.write(heart)
+
+        self.assertEqual(bytes(emulator.cgram[:8]), uploaded)
+
+    def test_overwritten_slot_is_uploaded_again(self):
+        lcd, emulator = _display(2)
+        cache = st7036_glyphs.GlyphCache(lcd)
+        bar = cache.register([0b11111] * 8)
+        cache.prepare(bar)
+        lcd.create_char(0, [0] * 8)
+
+        cache.prepare(bar)
+        self.assertEqual(bytes(emulator.cgram[:8]), bytes([0b11111] * 8))
+
+
+class StateFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'state.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_attach_in_the_same_boot(self):
+        lcd, emulator = _display(2)
+        lcd.write("kept")
+        lcd.save_state(self.path)
+
+        attached, emulator = _display(2, state_file=self.path)
+        atexit.unregister(attached.save_state)
+        self.assertEqual(attached.visible_bytes()[:4], b"kept")
+        self.assertEqual(emulator.registers, {})
+
+    def test_attach_releases_reset_pin(self):
+        lcd, emulator = _display(2)
+        lcd.save_state(self.path)
+
+        transport = st7036_transport.FakeTransport()
+        attached = st7036.st7036(25, rows=2, reset_pin=12, transport=transport,
+                                 timing=st7036_benchmark.RecordingTiming(), state_file=self.path)
+        atexit.unregister(attached.save_state)
+
+        self.assertEqual(transport.levels.get(12), st7036_transport.HIGH)
+        self.assertNotIn((12, st7036_transport.LOW), [output[:2] for output in transport.outputs])
+
+    def test_state_from_another_boot_is_ignored(self):
+        lcd, emulator = _display(2)
+        lcd.write("kept")
+        lcd.save_state(self.path)
+
+        boot_id = st7036.BOOT_ID_PATH
+        st7036.BOOT_ID_PATH = os.path.join(self.directory, 'boot_id')
+        try:
+            with open(st7036.BOOT_ID_PATH, 'w') as f:
+                f.write("another boot\n")
+            initialised, emulator = _display(2, state_file=self.path)
+            atexit.unregister(initialised.save_state)
+        finally:
+            st7036.BOOT_ID_PATH = boot_id
+
+        self.assertEqual(initialised.visible_bytes(), b" " * 32)
+        self.assertTrue(emulator.display_on)
+
+
+class ResetTest(unittest.TestCase):
+    def test_reset_without_pin_keeps_state(self):
+        lcd, emulator = _display(2, framebuffer=True)
+        lcd.draw(0, 0, "HELLO WORLD")
+        lcd.flush()
+
+        lcd.reset()
+        lcd.restore()
+        lcd.clear_framebuffer()
+        lcd.flush()
+
+        self.assertEqual(emulator.text()[0], " " * 16)
+
+    def test_reset_with_pin_forgets_state(self):
+        lcd, emulator = _display(2, framebuffer=True, reset_pin=12)
+        lcd.draw(0, 0, "HELLO WORLD")
+        lcd.flush()
+
+        lcd.reset()
+        lcd.restore()
+        lcd.flush()
+
+        self.assertEqual(lcd.visible_bytes(), _shown(emulator))
+        self.assertEqual(emulator.text()[0], "HELLO WORLD     ")
+
+
+class GraphWidgetTest(unittest.TestCase):
+    def test_sparkline_and_progress_bar_do_not_fit(self):
+        lcd, emulator = _display(3)
+        st7036_widgets.Sparkline(lcd, 0, 0, 16)
+        self.assertRaises(ValueError, st7036_widgets.ProgressBar, lcd, 0, 1, 16, value=33)
+
+    def test_progress_bars_share_glyphs(self):
+        lcd, emulator = _display(3)
+        first = st7036_widgets.ProgressBar(lcd, 0, 0, 16, value=33)
+        second = st7036_widgets.ProgressBar(lcd, 0, 1, 16, value=66)
+        shown = lcd.visible_bytes()
+        slots = set(code for code in bytearray(shown) if code < 8)
+        bitmaps = [bytes(emulator.cgram[slot * 8:slot * 8 + 8]) for slot in slots]
+
+        cache = st7036_widgets.glyph_cache(lcd)
+        for level in range(8):
+            cache.prepare(cache.register([level] * 8))
+
+        self.assertEqual(lcd.visible_bytes(), shown)
+        self.assertEqual([bytes(emulator.cgram[slot * 8:slot * 8 + 8]) for slot in slots], bitmaps)
+        self.assertEqual(first.glyphs, second.glyphs)
+
+
+class ShiftedWidgetTest(unittest.TestCase):
+    def test_widgets_follow_display_shift(self):
+        for framebuffer in (False, True):
+            lcd, emulator = _display(2, framebuffer=framebuffer)
+            lcd.show_page(1)
+            field = st7036_widgets.TextField(lcd, 0, 0, 16, value="on page one")
+            if framebuffer:
+                lcd.flush()
+            self.assertEqual(emulator.text()[0], "on page one     ")
+
+            # shifted by 30 the row wraps round the end of its DDRAM line
+            for step in range(14):
+                lcd.shift_left()
+            field.set("wrapped round the line end"[:16])
+            if framebuffer:
+                lcd.flush()
+            self.assertEqual(emulator.text()[0], "wrapped round th")
+            self.assertEqual(lcd.visible_bytes(), _shown(emulator))
+
+
+class PresentTest(unittest.TestCase):
+    def test_widget_changes_are_presented(self):
+        lcd, emulator = _display(2, framebuffer=True)
+        scheduler = st7036_present.PresentScheduler(lcd, rate=10, clock=lambda: 0.0)
+        field = st7036_widgets.TextField(lcd, 0, 0, 16)
+
+        for tick in range(5):
+            field.set("update %d" % tick)
+            scheduler.present(tick / 10.0 + 0.05)
+
+        self.assertEqual(emulator.text()[0], "update 4        ")
+        self.assertEqual(scheduler.presented, 5)
+        self.assertEqual(scheduler.skipped, 0)
+
+        scheduler.present(0.55)
+        self.assertEqual(scheduler.skipped, 1)
+
+
+class WorkerTest(unittest.TestCase):
+    def test_bad_char_map_is_rejected_by_the_caller(self):
+        lcd, emulator = _display(2, framebuffer=True)
+        worker = st7036_worker.DisplayWorker(lcd)
+        try:
+            self.assertRaises(ValueError, worker.create_char, 0, [0b11111] * 7)
+            worker.write_at(0, 0, "still running")
+            worker.sync(1.0)
+        finally:
+            worker.stop()
+
+        self.assertEqual(emulator.text()[0], "still running   ")
+
+
+class TraceTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'trace.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _trace(self, rows, actions):
+        transport = st7036_trace.TraceTransport(st7036_transport.FakeTransport(), self.path)
+        lcd = st7036.st7036(25, rows=rows, transport=transport, timing=st7036_benchmark.RecordingTiming())
+        actions(lcd)
+        transport.close()
+        return st7036_trace.read(self.path)
+
+    def test_replay_waits_for_clear_ending_a_batch(self):
+        records = self._trace(2, lambda lcd: lcd.write_commands([0x0C, 0x01]))
+        last = max(i for i, record in enumerate(records) if record.start)
+        batch = records[last:]
+        self.assertEqual([record.byte for record in batch], [0x0C, 0x01])
+
+        transport = st7036_transport.FakeTransport()
+        transport.setup(25)
+        timing = st7036_benchmark.RecordingTiming()
+        st7036_trace.replay(batch, transport, speed=None, timing=timing)
+
+        profile = st7036_timing.DATASHEET
+        self.assertGreaterEqual(timing.requested, profile.clear - profile.command - 0.000001)
+
+    def test_analyse_follows_two_line_address_counter(self):
+        def actions(lcd):
+            lcd.set_cursor_offset(0x20)
+            lcd.write("ABCDEFGHIJKL")
+            lcd.set_cursor_offset(0x40)
+            lcd.write("IJKL")
+
+        result = st7036_trace.analyse(self._trace(2, actions), rows=2)
+        self.assertEqual(result['unchanged_cells'], 4)
+
+
+class StatsTest(unittest.TestCase):
+    def test_async_calls_are_counted(self):
+        lcd, emulator = _display(2, framebuffer=True)
+        stats = lcd.enable_stats()
+        display = st7036_async.AsyncST7036(lcd)
+
+        async def run():
+            await display.write("hello")
+            display.draw(0, 1, "world")
+            await display.flush()
+            await display.close()
+
+        asyncio.run(run())
+        self.assertEqual(stats.calls['write'], 1)
+        self.assertEqual(stats.calls['flush'], 1)
+        self.assertEqual(stats.latency['flush'].count, 1)
+
+    def test_manager_flush_is_counted(self):
+        lcd, emulator = _display(2, framebuffer=True)
+        stats = lcd.enable_stats()
+        manager = st7036_multi.DisplayManager()
+        manager.add('main', lcd)
+        manager.draw(0, 0, "hello")
+        manager.flush()
+        manager.close()
+
+        self.assertEqual(stats.calls['flush'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()